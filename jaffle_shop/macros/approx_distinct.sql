@@ -0,0 +1,71 @@
+{#
+    Distinct counts for high-cardinality metrics.
+
+    count_distinct: exact COUNT(DISTINCT) by default. With the approx_distinct
+    var, engines with HyperLogLog sketches use APPROX_COUNT_DISTINCT
+    (relative error around 1-2%); other engines (SQLite) stay exact.
+
+    kmv_*: K-minimum-values sketches, for engines without HyperLogLog and for
+    rollups. A sketch keeps the K smallest hashes of the values of a group;
+    sketches are merged by keeping the K smallest hashes of their union, so
+    weekly/monthly distinct counts come from the daily sketches without
+    rescanning the orders. Groups with fewer than K values are counted exactly,
+    larger ones have a relative standard error of about 1 / sqrt(K - 2)
+    (about 3% with the default K = 1024).
+#}
+
+{% macro count_distinct(column) %}
+    {%- if var('approx_distinct', false) and target.type in ('duckdb', 'bigquery', 'snowflake') -%}
+        APPROX_COUNT_DISTINCT({{ column }})
+    {%- else -%}
+        COUNT(DISTINCT {{ column }})
+    {%- endif -%}
+{% endmacro %}
+
+{% macro kmv_hash(column) %}
+    {#- Hash of a value, uniform in [0, 2^32) -#}
+    {%- if target.type == 'duckdb' -%}
+        CAST(HASH({{ column }}) % 4294967296 AS BIGINT)
+    {%- elif target.type == 'bigquery' -%}
+        MOD(MOD(FARM_FINGERPRINT(CAST({{ column }} AS STRING)), 4294967296) + 4294967296, 4294967296)
+    {%- elif target.type == 'snowflake' -%}
+        MOD(MOD(HASH({{ column }}), 4294967296) + 4294967296, 4294967296)
+    {%- else -%}
+        {#- SQLite has no hash function: multiplicative (Knuth) hash of integer ids -#}
+        (CAST({{ column }} AS BIGINT) * 2654435761) % 4294967296
+    {%- endif -%}
+{% endmacro %}
+
+{% macro kmv_sketch(source, group_by, k=var('distinct_sketch_size', 1024)) %}
+    {#- Keeps the k smallest distinct hash_value of each group of source -#}
+    SELECT
+        {{ group_by | join(',\n        ') }},
+        hash_value
+    FROM (
+
+        SELECT
+            {{ group_by | join(',\n            ') }},
+            hash_value,
+            ROW_NUMBER() OVER (
+                PARTITION BY {{ group_by | join(', ') }}
+                ORDER BY hash_value
+            ) AS hash_rank
+        FROM (
+            SELECT DISTINCT
+                {{ group_by | join(',\n                ') }},
+                hash_value
+            FROM {{ source }}
+        ) AS distinct_hashes
+
+    ) AS ranked_hashes
+    WHERE hash_rank <= {{ k }}
+{% endmacro %}
+
+{% macro kmv_estimate(hash_column='hash_value', k=var('distinct_sketch_size', 1024)) %}
+    {#- Distinct count of a group of kmv_sketch rows (aggregate expression) -#}
+    CASE
+        WHEN COUNT({{ hash_column }}) < {{ k }}
+            THEN COUNT({{ hash_column }})
+        ELSE CAST(ROUND(({{ k }} - 1) * 4294967296.0 / (MAX({{ hash_column }}) + 1)) AS INTEGER)
+    END
+{% endmacro %}
@@ -0,0 +1,35 @@
+{#
+    First day of the week (Monday) or month of a date, as a DATE.
+    SQLite has no DATE_TRUNC, so dates are moved with modifiers there.
+#}
+
+{% macro week_start(date_column) %}
+    {%- if target.type == 'sqlite' -%}
+        {#- 'weekday 0' moves to the next Sunday (or stays on it), 6 days back is its Monday -#}
+        DATE({{ date_column }}, 'weekday 0', '-6 days')
+    {%- elif target.type == 'bigquery' -%}
+        DATE_TRUNC(DATE({{ date_column }}), ISOWEEK)
+    {%- else -%}
+        CAST({{ dbt.date_trunc('week', date_column) }} AS DATE)
+    {%- endif -%}
+{% endmacro %}
+
+{% macro month_start(date_column) %}
+    {%- if target.type == 'sqlite' -%}
+        DATE({{ date_column }}, 'start of month')
+    {%- elif target.type == 'bigquery' -%}
+        DATE_TRUNC(DATE({{ date_column }}), MONTH)
+    {%- else -%}
+        CAST({{ dbt.date_trunc('month', date_column) }} AS DATE)
+    {%- endif -%}
+{% endmacro %}
+
+{% macro period_start(grain, date_column) %}
+    {%- if grain == 'week' -%}
+        {{ week_start(date_column) }}
+    {%- elif grain == 'month' -%}
+        {{ month_start(date_column) }}
+    {%- else -%}
+        {{ exceptions.raise_compiler_error("period_start: grain must be 'week' or 'month', got '" ~ grain ~ "'") }}
+    {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,14 @@
+{#
+    Relation of a raw entity (raw_customers, raw_orders, ...): the seed by
+    default, or with the use_loaded_tables var the loaded_raw_* table written
+    by scripts/load_partitions.py (source 'loaded'), which dbt seed never
+    replaces.
+#}
+
+{% macro raw_relation(name) %}
+    {%- if var('use_loaded_tables', false) -%}
+        {{ source('loaded', name) }}
+    {%- else -%}
+        {{ ref(name) }}
+    {%- endif -%}
+{% endmacro %}
@@ -0,0 +1,140 @@
+{#
+    Rollups of the daily aggregates. Each rollup reads daily rows only, so its
+    cost follows the number of days, not the number of orders.
+
+    Incremental runs recompute the days (or periods) of the orders created
+    since the last run: every daily model and rollup stores
+    last_order_created_at, the latest created_at of the orders it aggregated.
+    The daily models find the order dates of the orders created since their
+    watermark in stg_orders (daily_refresh_start); the rollups find the days
+    whose watermark in the daily model moved past their own
+    (rollup_refresh_start), so they never scan the orders. Late orders of past
+    periods are picked up, and orders dated in the future do not move the
+    window. Items added to an existing order later are not tracked (items only
+    arrive with new orders).
+#}
+
+{% macro daily_refresh_start() %}
+    {#- First order date to recompute in an incremental run of a daily model (a subquery, NULL when there is no new order) -#}
+    (
+        SELECT MIN(DATE(order_date))
+        FROM {{ ref('stg_orders') }}
+        WHERE order_date IS NOT NULL
+            AND created_at >= (
+                SELECT MAX(last_order_created_at)
+                FROM {{ this }}
+            )
+    )
+{% endmacro %}
+
+{% macro rollup_refresh_start(grain, daily_model) %}
+    {#- Start of the first period to recompute in an incremental run, from the watermarks of the daily model it rolls up -#}
+    (
+        SELECT {{ period_start(grain, 'MIN(sale_date)') }}
+        FROM {{ ref(daily_model) }}
+        WHERE last_order_created_at >= (
+            SELECT MAX(last_order_created_at)
+            FROM {{ this }}
+        )
+    )
+{% endmacro %}
+
+{% macro sales_summary_rollup(grain) %}
+    {#- daily_sales_summary rolled up to weeks or months; distinct counts merge the daily sketches -#}
+WITH daily_sales AS (
+
+    SELECT
+        {{ period_start(grain, 'sale_date') }} AS period_start,
+        *
+    FROM {{ ref('daily_sales_summary') }}
+    WHERE 1 = 1
+    {% if is_incremental() %}
+        AND sale_date >= {{ rollup_refresh_start(grain, 'daily_sales_summary') }}
+    {% endif %}
+
+)
+
+, daily_sketches AS (
+
+    SELECT
+        {{ period_start(grain, 'sale_date') }} AS period_start,
+        metric,
+        hash_value
+    FROM {{ ref('int_daily_distinct_sketches') }}
+    WHERE 1 = 1
+    {% if is_incremental() %}
+        AND sale_date >= {{ rollup_refresh_start(grain, 'daily_sales_summary') }}
+    {% endif %}
+
+)
+
+, period_distinct_counts AS (
+
+    SELECT
+        period_start,
+        metric,
+        {{ kmv_estimate() }} AS distinct_count
+    FROM (
+        {{ kmv_sketch('daily_sketches', ['period_start', 'metric']) }}
+    ) AS merged_sketches
+    GROUP BY period_start, metric
+
+)
+
+, period_metrics AS (
+
+    SELECT
+        period_start,
+        COUNT(*) AS days_with_sales,
+        MAX(sale_date) AS last_sale_date,
+        -- Sales metrics
+        SUM(total_orders) AS total_orders,
+        SUM(total_revenue) AS total_revenue,
+        SUM(total_revenue) / SUM(total_orders) AS avg_order_value,
+        SUM(total_items_sold) AS total_items_sold,
+        -- Payment method distribution
+        SUM(credit_card_orders) AS credit_card_orders,
+        SUM(debit_card_orders) AS debit_card_orders,
+        SUM(cash_orders) AS cash_orders,
+        -- Order status distribution
+        SUM(delivered_orders) AS delivered_orders,
+        SUM(shipped_orders) AS shipped_orders,
+        SUM(pending_orders) AS pending_orders,
+        SUM(cancelled_orders) AS cancelled_orders,
+        -- High value orders
+        SUM(high_value_orders) AS high_value_orders,
+        SUM(high_value_revenue) AS high_value_revenue,
+        MAX(last_order_created_at) AS last_order_created_at
+    FROM daily_sales
+    GROUP BY period_start
+
+)
+
+SELECT
+    pm.period_start AS {{ grain }}_start,
+    pm.days_with_sales,
+    pm.last_sale_date,
+    pm.total_orders,
+    COALESCE(customers.distinct_count, 0) AS unique_customers,
+    pm.total_revenue,
+    pm.avg_order_value,
+    pm.total_items_sold,
+    pm.credit_card_orders,
+    pm.debit_card_orders,
+    pm.cash_orders,
+    pm.delivered_orders,
+    pm.shipped_orders,
+    pm.pending_orders,
+    pm.cancelled_orders,
+    pm.high_value_orders,
+    pm.high_value_revenue,
+    COALESCE(products.distinct_count, 0) AS unique_products_sold,
+    pm.last_order_created_at
+FROM period_metrics AS pm
+LEFT JOIN period_distinct_counts AS customers
+ON pm.period_start = customers.period_start
+    AND customers.metric = 'customers'
+LEFT JOIN period_distinct_counts AS products
+ON pm.period_start = products.period_start
+    AND products.metric = 'products'
+{% endmacro %}
@@ -0,0 +1,9 @@
+{% macro sqlite__snapshot_hash_arguments(args) %}
+    -- dbt-sqlite uses md5() from the crypto extension, which is not loaded
+    -- by profiles.yml. Concatenating the arguments (unique key and
+    -- updated_at) is enough to build a unique dbt_scd_id.
+    ({%- for arg in args -%}
+        COALESCE(CAST({{ arg }} AS TEXT), '')
+        {%- if not loop.last %} || '|' || {% endif -%}
+    {%- endfor -%})
+{% endmacro %}
@@ -1,19 +1,4 @@
-WITH order_summary AS (
-
-    SELECT
-        order_id,
-        COUNT(*) AS total_items,
-        SUM(quantity) AS total_quantity,
-        SUM(calculated_total_price) AS calculated_total,
-        AVG(unit_price) AS avg_unit_price,
-        MAX(unit_price) AS max_unit_price,
-        MIN(unit_price) AS min_unit_price
-    FROM {{ ref('stg_items') }}
-    GROUP BY order_id
-
-)
-
-, final AS (
+WITH final AS (
 
     SELECT
         o.order_id,
@@ -57,7 +42,7 @@ WITH order_summary AS (
     FROM {{ ref('stg_orders') }} AS o
     LEFT JOIN {{ ref('stg_customers') }} AS c 
     ON o.customer_id = c.customer_id
-    LEFT JOIN order_summary os 
+    LEFT JOIN {{ ref('int_order_items_agg') }} AS os 
     ON o.order_id = os.order_id
 
 )
@@ -0,0 +1,49 @@
+{{
+  config(
+    materialized = var('intermediate_materialized', 'table'),
+    unique_key = 'customer_id'
+    )
+}}
+
+-- Order metrics at customer grain, built once and shared by the marts.
+-- When materialized as incremental, only customers with new orders are
+-- re-aggregated.
+WITH
+
+{% if is_incremental() %}
+
+changed_customers AS (
+
+    SELECT DISTINCT customer_id
+    FROM {{ ref('stg_orders') }}
+    WHERE created_at >= (
+        SELECT MAX(last_order_created_at)
+        FROM {{ this }}
+    )
+
+),
+
+{% endif %}
+
+customer_orders AS (
+
+    SELECT
+        ord.customer_id,
+        COUNT(ord.order_id) AS total_orders,
+        SUM(ord.total_amount) AS total_spent,
+        AVG(ord.total_amount) AS avg_order_value,
+        MAX(ord.total_amount) AS max_order_value,
+        MIN(ord.total_amount) AS min_order_value,
+        MIN(ord.order_date) AS first_order_date,
+        MAX(ord.order_date) AS last_order_date,
+        MAX(ord.created_at) AS last_order_created_at
+    FROM {{ ref('stg_orders') }} AS ord
+    {% if is_incremental() %}
+    WHERE ord.customer_id IN (SELECT customer_id FROM changed_customers)
+    {% endif %}
+    GROUP BY ord.customer_id
+
+)
+
+SELECT *
+FROM customer_orders
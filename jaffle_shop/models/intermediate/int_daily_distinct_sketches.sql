@@ -0,0 +1,76 @@
+{{
+  config(
+    materialized = var('intermediate_materialized', 'table'),
+    incremental_strategy = 'delete+insert',
+    unique_key = 'sale_date'
+    )
+}}
+
+-- K-minimum-values sketches of the daily distinct customers and products
+-- (see macros/approx_distinct.sql). Rollups merge the daily sketches with
+-- kmv_sketch/kmv_estimate instead of rescanning the orders. When
+-- materialized as incremental, only the days of the orders created since
+-- the last run are re-sketched.
+WITH filtered_orders AS (
+
+    SELECT
+        order_id,
+        customer_id,
+        DATE(order_date) AS sale_date,
+        created_at
+    FROM {{ ref('stg_orders') }}
+    WHERE 1 = 1
+        AND order_date IS NOT NULL
+    {% if is_incremental() %}
+        AND DATE(order_date) >= {{ daily_refresh_start() }}
+    {% endif %}
+
+)
+
+, daily_hashes AS (
+
+    SELECT
+        sale_date,
+        'customers' AS metric,
+        {{ kmv_hash('customer_id') }} AS hash_value
+    FROM filtered_orders
+    WHERE customer_id IS NOT NULL
+
+    UNION ALL
+
+    SELECT
+        o.sale_date,
+        'products' AS metric,
+        {{ kmv_hash('i.product_id') }} AS hash_value
+    FROM filtered_orders AS o
+    INNER JOIN {{ ref('stg_items') }} AS i
+    ON o.order_id = i.order_id
+    WHERE i.product_id IS NOT NULL
+
+)
+
+-- Watermark of the incremental runs (see macros/rollups.sql)
+, daily_watermarks AS (
+
+    SELECT
+        sale_date,
+        MAX(created_at) AS last_order_created_at
+    FROM filtered_orders
+    GROUP BY sale_date
+
+)
+
+, daily_sketches AS (
+
+    {{ kmv_sketch('daily_hashes', ['sale_date', 'metric']) }}
+
+)
+
+SELECT
+    s.sale_date,
+    s.metric,
+    s.hash_value,
+    w.last_order_created_at
+FROM daily_sketches AS s
+INNER JOIN daily_watermarks AS w
+ON s.sale_date = w.sale_date
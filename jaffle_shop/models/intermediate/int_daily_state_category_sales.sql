@@ -0,0 +1,49 @@
+{{
+  config(
+    materialized = var('intermediate_materialized', 'table'),
+    incremental_strategy = 'delete+insert',
+    unique_key = 'sale_date'
+    )
+}}
+
+-- Item sales at day x customer state x product category grain, the base of
+-- the state/category rollups. When materialized as incremental, only the
+-- days of the orders created since the last run are re-aggregated.
+WITH filtered_orders AS (
+
+    SELECT
+        o.order_id,
+        DATE(o.order_date) AS sale_date,
+        COALESCE(c.state, 'unknown') AS state,
+        o.created_at
+    FROM {{ ref('stg_orders') }} AS o
+    LEFT JOIN {{ ref('stg_customers') }} AS c
+    ON o.customer_id = c.customer_id
+    WHERE 1 = 1
+        AND o.order_date IS NOT NULL
+    {% if is_incremental() %}
+        AND DATE(o.order_date) >= {{ daily_refresh_start() }}
+    {% endif %}
+
+)
+
+SELECT
+    o.sale_date,
+    o.state,
+    COALESCE(p.category, 'unknown') AS category,
+    -- Additive across days and states; an order with items of several
+    -- categories counts once in each of them
+    COUNT(DISTINCT o.order_id) AS total_orders,
+    COUNT(i.item_id) AS total_items,
+    SUM(i.quantity) AS total_quantity,
+    SUM(i.calculated_total_price) AS item_revenue,
+    MAX(o.created_at) AS last_order_created_at
+FROM filtered_orders AS o
+INNER JOIN {{ ref('stg_items') }} AS i
+ON o.order_id = i.order_id
+LEFT JOIN {{ ref('stg_products') }} AS p
+ON i.product_id = p.product_id
+GROUP BY
+    o.sale_date,
+    o.state,
+    COALESCE(p.category, 'unknown')
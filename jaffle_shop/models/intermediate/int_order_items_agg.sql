@@ -0,0 +1,48 @@
+{{
+  config(
+    materialized = var('intermediate_materialized', 'table'),
+    unique_key = 'order_id'
+    )
+}}
+
+-- Item metrics at order grain, built once and shared by the marts.
+-- When materialized as incremental, only orders with new items are
+-- re-aggregated.
+WITH
+
+{% if is_incremental() %}
+
+changed_orders AS (
+
+    SELECT DISTINCT order_id
+    FROM {{ ref('stg_items') }}
+    WHERE created_at >= (
+        SELECT MAX(last_item_created_at)
+        FROM {{ this }}
+    )
+
+),
+
+{% endif %}
+
+order_items AS (
+
+    SELECT
+        itm.order_id,
+        COUNT(*) AS total_items,
+        SUM(itm.quantity) AS total_quantity,
+        SUM(itm.calculated_total_price) AS calculated_total,
+        AVG(itm.unit_price) AS avg_unit_price,
+        MAX(itm.unit_price) AS max_unit_price,
+        MIN(itm.unit_price) AS min_unit_price,
+        MAX(itm.created_at) AS last_item_created_at
+    FROM {{ ref('stg_items') }} AS itm
+    {% if is_incremental() %}
+    WHERE itm.order_id IN (SELECT order_id FROM changed_orders)
+    {% endif %}
+    GROUP BY itm.order_id
+
+)
+
+SELECT *
+FROM order_items
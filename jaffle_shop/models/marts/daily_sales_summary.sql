@@ -7,18 +7,31 @@ WITH filtered_orders AS (
 
 )
 
+-- Distinct products need item grain, so they are counted separately
+-- instead of fanning out every order to its items
+, daily_products AS (
+
+    SELECT
+        DATE(o.order_date) AS sale_date,
+        {{ count_distinct('i.product_id') }} AS unique_products_sold
+    FROM filtered_orders AS o
+    INNER JOIN {{ ref('stg_items') }} AS i 
+    ON o.order_id = i.order_id
+    GROUP BY DATE(o.order_date)
+
+)
+
 , daily_metrics AS (
 
     SELECT
         DATE(o.order_date) AS sale_date,
         -- Sales metrics
-        COUNT(DISTINCT o.order_id) AS total_orders,
-        COUNT(DISTINCT o.customer_id) AS unique_customers,
+        COUNT(o.order_id) AS total_orders,
+        {{ count_distinct('o.customer_id') }} AS unique_customers,
         SUM(o.total_amount) AS total_revenue,
         AVG(o.total_amount) AS avg_order_value,
-        -- Item metrics
-        SUM(i.quantity) AS total_items_sold,
-        COUNT(DISTINCT i.product_id) AS unique_products_sold,
+        -- Item metrics (pre-aggregated per order)
+        SUM(os.total_quantity) AS total_items_sold,
         -- Payment method distribution
         SUM(
             CASE
@@ -82,13 +95,19 @@ WITH filtered_orders AS (
                     THEN o.total_amount
                 ELSE 0
             END
-        ) AS high_value_revenue
+        ) AS high_value_revenue,
+        -- Watermark of the incremental rollups (see macros/rollups.sql)
+        MAX(o.created_at) AS last_order_created_at
     FROM filtered_orders AS o
-    LEFT JOIN {{ ref('stg_items') }} AS i 
-    ON o.order_id = i.order_id
+    LEFT JOIN {{ ref('int_order_items_agg') }} AS os 
+    ON o.order_id = os.order_id
     GROUP BY DATE(o.order_date)
 
 )
 
-SELECT * 
-FROM daily_metrics
+SELECT
+    dm.*,
+    COALESCE(dp.unique_products_sold, 0) AS unique_products_sold
+FROM daily_metrics AS dm
+LEFT JOIN daily_products AS dp 
+ON dm.sale_date = dp.sale_date
@@ -0,0 +1,10 @@
+{{
+  config(
+    materialized = var('rollup_materialized', 'incremental'),
+    incremental_strategy = 'delete+insert',
+    unique_key = 'month_start'
+    )
+}}
+
+-- daily_sales_summary rolled up to months (starting on the 1st)
+{{ sales_summary_rollup('month') }}
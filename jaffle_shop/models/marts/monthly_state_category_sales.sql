@@ -0,0 +1,39 @@
+{{
+  config(
+    materialized = var('rollup_materialized', 'incremental'),
+    incremental_strategy = 'delete+insert',
+    unique_key = 'month_start'
+    )
+}}
+
+-- int_daily_state_category_sales rolled up to months; states or categories
+-- alone are sums of these rows (except total_orders across categories)
+WITH daily_sales AS (
+
+    SELECT
+        {{ month_start('sale_date') }} AS month_start,
+        *
+    FROM {{ ref('int_daily_state_category_sales') }}
+    WHERE 1 = 1
+    {% if is_incremental() %}
+        AND sale_date >= {{ rollup_refresh_start('month', 'int_daily_state_category_sales') }}
+    {% endif %}
+
+)
+
+SELECT
+    month_start,
+    state,
+    category,
+    COUNT(*) AS days_with_sales,
+    MAX(sale_date) AS last_sale_date,
+    SUM(total_orders) AS total_orders,
+    SUM(total_items) AS total_items,
+    SUM(total_quantity) AS total_quantity,
+    SUM(item_revenue) AS item_revenue,
+    MAX(last_order_created_at) AS last_order_created_at
+FROM daily_sales
+GROUP BY
+    month_start,
+    state,
+    category
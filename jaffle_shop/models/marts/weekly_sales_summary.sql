@@ -0,0 +1,10 @@
+{{
+  config(
+    materialized = var('rollup_materialized', 'incremental'),
+    incremental_strategy = 'delete+insert',
+    unique_key = 'week_start'
+    )
+}}
+
+-- daily_sales_summary rolled up to weeks (starting on Monday)
+{{ sales_summary_rollup('week') }}
@@ -25,7 +25,7 @@ WITH cleaned AS (
         END AS has_valid_phone,
         created_at,
         updated_at
-    FROM {{ ref('raw_customers') }}
+    FROM {{ raw_relation('raw_customers') }}
 )
 
 SELECT *
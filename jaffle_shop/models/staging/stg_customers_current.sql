@@ -0,0 +1,74 @@
+{{
+  config(
+    enabled = var('enable_cdc', false)
+    )
+}}
+
+-- Current state of customers: seed rows plus the latest change of each
+-- customer from the CDC change log, without deleted customers
+WITH versions AS (
+
+    SELECT
+        id,
+        first_name,
+        last_name,
+        email,
+        phone,
+        address,
+        city,
+        state,
+        zip_code,
+        created_at,
+        updated_at,
+        'insert' AS operation,
+        0 AS change_id
+    FROM {{ raw_relation('raw_customers') }}
+
+    UNION ALL
+
+    SELECT
+        id,
+        first_name,
+        last_name,
+        email,
+        phone,
+        address,
+        city,
+        state,
+        zip_code,
+        created_at,
+        updated_at,
+        operation,
+        change_id
+    FROM {{ ref('raw_customers_changes') }}
+
+)
+
+, ranked AS (
+
+    SELECT
+        *,
+        ROW_NUMBER() OVER (
+            PARTITION BY id
+            ORDER BY change_id DESC
+        ) AS version_rank
+    FROM versions
+
+)
+
+SELECT
+    id AS customer_id,
+    first_name,
+    last_name,
+    email,
+    phone,
+    address,
+    city,
+    state,
+    zip_code,
+    created_at,
+    updated_at
+FROM ranked
+WHERE 1 = 1
+    AND version_rank = 1
+    AND operation != 'delete'
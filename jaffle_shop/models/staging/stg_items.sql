@@ -1,5 +1,5 @@
 WITH source AS (
-    SELECT * FROM {{ ref('raw_items') }}
+    SELECT * FROM {{ raw_relation('raw_items') }}
 ),
 
 cleaned AS (
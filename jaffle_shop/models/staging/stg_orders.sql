@@ -25,7 +25,7 @@ WITH cleaned AS (
         COALESCE(status IN ('delivered', 'shipped'), FALSE) AS is_fulfilled,
         -- Timestamps
         created_at
-    FROM {{ ref('raw_orders') }}
+    FROM {{ raw_relation('raw_orders') }}
 
 )
 
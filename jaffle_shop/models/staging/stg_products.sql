@@ -67,7 +67,7 @@ WITH cleaned AS (
                 THEN 'Luxury'
             ELSE 'Unknown'
         END AS price_range
-    FROM {{ ref('raw_products') }}
+    FROM {{ raw_relation('raw_products') }}
 )
 
 SELECT * 
@@ -0,0 +1,65 @@
+{{
+  config(
+    enabled = var('enable_cdc', false)
+    )
+}}
+
+-- Current state of products: seed rows plus the latest change of each
+-- product from the CDC change log, without deleted products
+WITH versions AS (
+
+    SELECT
+        id,
+        name,
+        category,
+        price,
+        description,
+        brand,
+        created_at,
+        updated_at,
+        'insert' AS operation,
+        0 AS change_id
+    FROM {{ raw_relation('raw_products') }}
+
+    UNION ALL
+
+    SELECT
+        id,
+        name,
+        category,
+        price,
+        description,
+        brand,
+        created_at,
+        updated_at,
+        operation,
+        change_id
+    FROM {{ ref('raw_products_changes') }}
+
+)
+
+, ranked AS (
+
+    SELECT
+        *,
+        ROW_NUMBER() OVER (
+            PARTITION BY id
+            ORDER BY change_id DESC
+        ) AS version_rank
+    FROM versions
+
+)
+
+SELECT
+    id AS product_id,
+    name AS product_name,
+    category,
+    price,
+    description,
+    brand,
+    created_at,
+    updated_at
+FROM ranked
+WHERE 1 = 1
+    AND version_rank = 1
+    AND operation != 'delete'
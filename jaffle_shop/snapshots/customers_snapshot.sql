@@ -0,0 +1,16 @@
+{% snapshot customers_snapshot %}
+
+{{
+  config(
+    enabled = var('enable_cdc', false),
+    unique_key = 'customer_id',
+    strategy = 'timestamp',
+    updated_at = 'updated_at',
+    hard_deletes = 'invalidate'
+    )
+}}
+
+SELECT *
+FROM {{ ref('stg_customers_current') }}
+
+{% endsnapshot %}
@@ -0,0 +1,16 @@
+{% snapshot products_snapshot %}
+
+{{
+  config(
+    enabled = var('enable_cdc', false),
+    unique_key = 'product_id',
+    strategy = 'timestamp',
+    updated_at = 'updated_at',
+    hard_deletes = 'invalidate'
+    )
+}}
+
+SELECT *
+FROM {{ ref('stg_products_current') }}
+
+{% endsnapshot %}
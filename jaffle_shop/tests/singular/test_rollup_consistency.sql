@@ -0,0 +1,76 @@
+-- Test that the incremental rollups match a full aggregation of the orders
+-- (run after an incremental run to catch periods that were not refreshed)
+WITH expected AS (
+
+    {% for grain in ['week', 'month'] %}
+    SELECT
+        '{{ grain }}' AS grain,
+        {{ period_start(grain, 'order_date') }} AS period_start,
+        COUNT(order_id) AS total_orders,
+        SUM(total_amount) AS total_revenue
+    FROM {{ ref('stg_orders') }}
+    WHERE order_date IS NOT NULL
+    GROUP BY {{ period_start(grain, 'order_date') }}
+    {% if not loop.last %}UNION ALL{% endif %}
+    {% endfor %}
+
+),
+
+actual AS (
+
+    SELECT
+        'week' AS grain,
+        week_start AS period_start,
+        total_orders,
+        total_revenue
+    FROM {{ ref('weekly_sales_summary') }}
+
+    UNION ALL
+
+    SELECT
+        'month' AS grain,
+        month_start AS period_start,
+        total_orders,
+        total_revenue
+    FROM {{ ref('monthly_sales_summary') }}
+
+),
+
+validation AS (
+
+    SELECT
+        e.grain,
+        e.period_start,
+        e.total_orders AS expected_orders,
+        a.total_orders AS actual_orders,
+        e.total_revenue AS expected_revenue,
+        a.total_revenue AS actual_revenue
+    FROM expected e
+    LEFT JOIN actual a
+        ON e.grain = a.grain
+        AND e.period_start = a.period_start
+
+    UNION ALL
+
+    -- Periods that no longer have orders
+    SELECT
+        a.grain,
+        a.period_start,
+        NULL AS expected_orders,
+        a.total_orders AS actual_orders,
+        NULL AS expected_revenue,
+        a.total_revenue AS actual_revenue
+    FROM actual a
+    LEFT JOIN expected e
+        ON a.grain = e.grain
+        AND a.period_start = e.period_start
+    WHERE e.period_start IS NULL
+
+)
+
+SELECT *
+FROM validation
+WHERE expected_orders IS NULL
+    OR actual_orders IS NULL
+    OR expected_orders <> actual_orders
+    OR ABS(expected_revenue - actual_revenue) > 0.01
@@ -0,0 +1,79 @@
+-- Test that monthly_state_category_sales matches a full aggregation of the
+-- items (run after an incremental run to catch months that were not refreshed)
+WITH expected AS (
+
+    SELECT
+        {{ month_start('o.order_date') }} AS month_start,
+        COALESCE(c.state, 'unknown') AS state,
+        COALESCE(p.category, 'unknown') AS category,
+        COUNT(i.item_id) AS total_items,
+        SUM(i.calculated_total_price) AS item_revenue
+    FROM {{ ref('stg_orders') }} o
+    LEFT JOIN {{ ref('stg_customers') }} c
+        ON o.customer_id = c.customer_id
+    INNER JOIN {{ ref('stg_items') }} i
+        ON o.order_id = i.order_id
+    LEFT JOIN {{ ref('stg_products') }} p
+        ON i.product_id = p.product_id
+    WHERE o.order_date IS NOT NULL
+    GROUP BY
+        {{ month_start('o.order_date') }},
+        COALESCE(c.state, 'unknown'),
+        COALESCE(p.category, 'unknown')
+
+),
+
+actual AS (
+
+    SELECT
+        month_start,
+        state,
+        category,
+        total_items,
+        item_revenue
+    FROM {{ ref('monthly_state_category_sales') }}
+
+),
+
+validation AS (
+
+    SELECT
+        e.month_start,
+        e.state,
+        e.category,
+        e.total_items AS expected_items,
+        a.total_items AS actual_items,
+        e.item_revenue AS expected_revenue,
+        a.item_revenue AS actual_revenue
+    FROM expected e
+    LEFT JOIN actual a
+        ON e.month_start = a.month_start
+        AND e.state = a.state
+        AND e.category = a.category
+
+    UNION ALL
+
+    -- Groups that no longer have items
+    SELECT
+        a.month_start,
+        a.state,
+        a.category,
+        NULL AS expected_items,
+        a.total_items AS actual_items,
+        NULL AS expected_revenue,
+        a.item_revenue AS actual_revenue
+    FROM actual a
+    LEFT JOIN expected e
+        ON a.month_start = e.month_start
+        AND a.state = e.state
+        AND a.category = e.category
+    WHERE e.month_start IS NULL
+
+)
+
+SELECT *
+FROM validation
+WHERE expected_items IS NULL
+    OR actual_items IS NULL
+    OR expected_items <> actual_items
+    OR ABS(expected_revenue - actual_revenue) > 0.01
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Checks that the incremental rollups pick up late-arriving orders
+Builds the rollups incrementally, inserts orders created now for a past, the
+current and a future date into the raw tables, runs the rollups again and runs
+the rollup consistency tests, which compare them with a full aggregation
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import argparse
+from datetime import date, datetime, timedelta
+from dbt.cli.main import dbtRunner
+from config import DBT_PROJECT_DIR, DATABASE_FILE
+
+# Rollups (and their upstream models, with the + selector) built by the check
+ROLLUPS = ['weekly_sales_summary', 'monthly_sales_summary', 'monthly_state_category_sales']
+
+# Singular tests comparing the rollups with a full aggregation
+CONSISTENCY_TESTS = ['test_rollup_consistency', 'test_state_category_rollup_consistency']
+
+def invoke(args):
+    """Runs a dbt command in-process; returns True on success"""
+    print(f"\n$ dbt {' '.join(args)}")
+    return dbtRunner().invoke(args).success
+
+def late_order_dates(connection, orders_table, past_days):
+    """Order dates of the late orders: past_days before the latest past order, today and 10 days ahead"""
+    today = date.today()
+    latest = connection.execute(
+        f'SELECT MAX(DATE(order_date)) FROM "{orders_table}" WHERE DATE(order_date) <= ?',
+        (today.isoformat(),)
+    ).fetchone()[0]
+    past = (date.fromisoformat(latest) if latest else today) - timedelta(days=past_days)
+    return [past, today, today + timedelta(days=10)]
+
+def insert_late_orders(connection, orders_table, items_table, order_dates, copies):
+    """
+    Copies `copies` existing orders (and their items) to each order date, with new
+    ids and created_at after every existing row; returns the ids of the new orders
+    """
+    created_at = max(
+        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        connection.execute(f'SELECT MAX(created_at) FROM "{orders_table}"').fetchone()[0] or ''
+    )
+    next_order_id = connection.execute(f'SELECT MAX(id) FROM "{orders_table}"').fetchone()[0] + 1
+    next_item_id = connection.execute(f'SELECT MAX(item_id) FROM "{items_table}"').fetchone()[0] + 1
+    templates = [
+        row[0] for row in connection.execute(
+            f'SELECT id FROM "{orders_table}" WHERE id IN (SELECT order_id FROM "{items_table}") ORDER BY id LIMIT ?',
+            (copies,)
+        )
+    ]
+
+    order_ids = []
+    for order_date in order_dates:
+        for template_id in templates:
+            connection.execute(
+                f'INSERT INTO "{orders_table}" (id, customer_id, order_date, status, total_amount, payment_method, '
+                f'delivery_address, created_at) SELECT ?, customer_id, ?, status, total_amount, payment_method, '
+                f'delivery_address, ? FROM "{orders_table}" WHERE id = ?',
+                (next_order_id, order_date.isoformat(), created_at, template_id)
+            )
+            for (item_id,) in connection.execute(
+                f'SELECT item_id FROM "{items_table}" WHERE order_id = ? ORDER BY item_id', (template_id,)
+            ).fetchall():
+                connection.execute(
+                    f'INSERT INTO "{items_table}" (item_id, order_id, product_id, quantity, unit_price, created_at) '
+                    f'SELECT ?, ?, product_id, quantity, unit_price, ? FROM "{items_table}" WHERE item_id = ?',
+                    (next_item_id, next_order_id, created_at, item_id)
+                )
+                next_item_id += 1
+            order_ids.append(next_order_id)
+            next_order_id += 1
+    connection.commit()
+    return order_ids
+
+def delete_late_orders(connection, orders_table, items_table, order_ids):
+    """Removes the orders inserted by the check (and their items)"""
+    placeholders = ', '.join('?' for _ in order_ids)
+    connection.execute(f'DELETE FROM "{items_table}" WHERE order_id IN ({placeholders})', order_ids)
+    connection.execute(f'DELETE FROM "{orders_table}" WHERE id IN ({placeholders})', order_ids)
+    connection.commit()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Check that the incremental rollups pick up late-arriving orders'
+    )
+    parser.add_argument(
+        '--project-dir',
+        type=str,
+        default=DBT_PROJECT_DIR,
+        help=f'dbt project directory (default: {DBT_PROJECT_DIR})'
+    )
+    parser.add_argument(
+        '--database',
+        type=str,
+        default=DATABASE_FILE,
+        help=f'SQLite database of the dbt profile (default: {DATABASE_FILE})'
+    )
+    parser.add_argument(
+        '--loaded-tables',
+        action='store_true',
+        help='Use the tables of load_partitions.py (use_loaded_tables var) instead of the seeds'
+    )
+    parser.add_argument(
+        '--past-days',
+        type=int,
+        default=45,
+        help='Days before the latest order of the late order in the past (default: 45)'
+    )
+    parser.add_argument(
+        '--copies',
+        type=int,
+        default=3,
+        help='Late orders inserted per date (default: 3)'
+    )
+    parser.add_argument(
+        '--keep',
+        action='store_true',
+        help='Keep the late orders instead of removing them and rebuilding the rollups'
+    )
+
+    args = parser.parse_args()
+    project_dir = os.path.abspath(args.project_dir)
+    database = os.path.abspath(args.database)
+    prefix = 'loaded_' if args.loaded_tables else ''
+    orders_table, items_table = f"{prefix}raw_orders", f"{prefix}raw_items"
+
+    dbt_vars = {'intermediate_materialized': 'incremental', 'rollup_materialized': 'incremental'}
+    if args.loaded_tables:
+        dbt_vars['use_loaded_tables'] = True
+    common = ['--profiles-dir', project_dir, '--vars', json.dumps(dbt_vars)]
+    select = ['--select'] + [f"+{rollup}" for rollup in ROLLUPS]
+
+    if not os.path.exists(database):
+        print(f"{database} not found. Run dbt seed (or load_partitions.py) first.")
+        sys.exit(1)
+
+    # Run from the project directory, like init_project.sh does
+    os.chdir(project_dir)
+
+    print(f"\n{'='*50}")
+    print("🔁 INCREMENTAL ROLLUPS CHECK")
+    print(f"{'='*50}")
+
+    if not invoke(['run'] + select + ['--full-refresh'] + common):
+        sys.exit(1)
+
+    connection = sqlite3.connect(database)
+    order_ids = []
+    try:
+        order_dates = late_order_dates(connection, orders_table, args.past_days)
+        order_ids = insert_late_orders(connection, orders_table, items_table, order_dates, args.copies)
+        print(f"\nInserted {len(order_ids)} late orders into {orders_table} for "
+              + ', '.join(order_date.isoformat() for order_date in order_dates))
+
+        passed = (
+            invoke(['run'] + select + common)
+            and invoke(['test', '--warn-error', '--select'] + CONSISTENCY_TESTS + common)
+        )
+    finally:
+        if order_ids and not args.keep:
+            delete_late_orders(connection, orders_table, items_table, order_ids)
+        connection.close()
+
+    if not args.keep:
+        print(f"\nRemoved the late orders from {orders_table}, rebuilding the rollups")
+        invoke(['run'] + select + ['--full-refresh'] + common)
+
+    if not passed:
+        print("\n❌ The incremental rollups differ from a full aggregation")
+        sys.exit(1)
+    print("\n✅ The incremental rollups picked up the late orders")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped columnar cache of generated entities
+The generators can write each entity as columns (one NumPy .npy file per column,
+or an uncompressed Arrow IPC file) under a key derived from the seed and the
+configuration. Loaders and benchmarks map the files instead of parsing CSV and
+slice them by ID range without copying.
+"""
+
+import hashlib
+import json
+import os
+import random
+import shutil
+import sys
+import time
+import argparse
+from faker import Faker
+import config
+from config import CACHE_DIR
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+CACHE_FORMATS = ['numpy', 'arrow']
+
+# Bumped when the layout or the values of the cache files change
+CACHE_VERSION = 2
+
+# Column the cache is sorted by (and sliced on), per entity
+ID_COLUMNS = {
+    'raw_customers': 'id',
+    'raw_products': 'id',
+    'raw_orders': 'id',
+    'raw_items': 'item_id'
+}
+
+# Config constants that are locations, not generation settings (left out of the key)
+PATH_SUFFIXES = ('_DIR', '_FILE', '_ROOT')
+
+MANIFEST_FILE = 'manifest.json'
+LATEST_FILE = 'LATEST'
+ARROW_FILE = 'data.arrow'
+
+def seed_generators(seed):
+    """Seeds random (and therefore the date engine) and Faker, for reproducible data"""
+    if seed is not None:
+        random.seed(seed)
+        Faker.seed(seed)
+
+def cache_key(entity, seed, params):
+    """
+    Key of a cache: hash of the entity, the seed, the generator parameters and
+    every generation setting of config.py, so that any change gives a new key
+    """
+    settings = {
+        name: getattr(config, name) for name in dir(config)
+        if name.isupper() and not name.endswith(PATH_SUFFIXES)
+    }
+    payload = json.dumps(
+        {'version': CACHE_VERSION, 'entity': entity, 'seed': seed, 'params': params, 'config': settings},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def column_kind(values):
+    """Storage type of a column: int64, float64, bool or string (None values are masked)"""
+    values = [value for value in values if value is not None]
+    if values and all(isinstance(value, bool) for value in values):
+        return 'bool'
+    if values and all(isinstance(value, int) for value in values):
+        return 'int64'
+    if values and all(isinstance(value, (int, float)) for value in values):
+        return 'float64'
+    return 'string'
+
+def write_numpy_column(path, name, values):
+    """
+    Writes <name>.npy (fixed-width kinds) or <name>.offsets.npy + <name>.data.npy
+    (UTF-8 bytes, Arrow-style) and <name>.mask.npy when the column has None values;
+    returns (kind, nullable)
+    """
+    kind = column_kind(values)
+    mask = np.fromiter((value is None for value in values), dtype=np.bool_, count=len(values))
+    nullable = bool(mask.any())
+
+    if kind == 'string':
+        encoded = [value.encode('utf-8') if value is not None else b'' for value in values]
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(values)), out=offsets[1:])
+        np.save(os.path.join(path, f"{name}.offsets.npy"), offsets)
+        np.save(os.path.join(path, f"{name}.data.npy"), np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    else:
+        fill = False if kind == 'bool' else 0
+        array = np.array([value if value is not None else fill for value in values], dtype=kind)
+        np.save(os.path.join(path, f"{name}.npy"), array)
+
+    if nullable:
+        np.save(os.path.join(path, f"{name}.mask.npy"), mask)
+    return kind, nullable
+
+def write_arrow_table(path, rows, fieldnames):
+    """Writes the rows as one uncompressed Arrow IPC file (mappable without copies)"""
+    from pipeline import ParquetEncoder
+
+    table = ParquetEncoder(fieldnames).encode(rows)
+    with pa.OSFile(os.path.join(path, ARROW_FILE), 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    kinds = {pa.bool_(): 'bool', pa.int64(): 'int64', pa.float64(): 'float64'}
+    return [
+        (field.name, kinds.get(field.type, 'string'), table.column(field.name).null_count > 0)
+        for field in table.schema
+    ]
+
+def write_cache(rows, entity, fieldnames, key, cache_format='numpy', cache_dir=CACHE_DIR, seed=None, params=None):
+    """
+    Writes the rows of an entity, sorted by its ID column, to <cache_dir>/<entity>/<key>
+    and marks the key as the latest of the entity; returns the cache directory
+    """
+    if cache_format == 'numpy' and np is None:
+        raise ImportError("The numpy cache requires numpy (pip install numpy)")
+    if cache_format == 'arrow' and pa is None:
+        raise ImportError("The arrow cache requires pyarrow (pip install pyarrow)")
+
+    entity_dir = os.path.join(cache_dir, entity)
+    path = os.path.join(entity_dir, key)
+    tmp_path = f"{path}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    # Sorted by ID so that ID ranges are contiguous row ranges (stable for duplicated IDs).
+    # Empty strings are stored as nulls, as dbt seed and the CSV loader read them
+    id_column = ID_COLUMNS.get(entity, fieldnames[0])
+    rows = [
+        {name: (None if row.get(name) == '' else row.get(name)) for name in fieldnames}
+        for row in sorted(rows, key=lambda row: row[id_column])
+    ]
+
+    if cache_format == 'arrow':
+        columns = write_arrow_table(tmp_path, rows, fieldnames)
+    else:
+        columns = [
+            (name, *write_numpy_column(tmp_path, name, [row.get(name) for row in rows]))
+            for name in fieldnames
+        ]
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'entity': entity,
+        'key': key,
+        'format': cache_format,
+        'num_rows': len(rows),
+        'id_column': id_column,
+        'columns': [{'name': name, 'kind': kind, 'nullable': nullable} for name, kind, nullable in columns],
+        'seed': seed,
+        'params': params or {}
+    }
+    with open(os.path.join(tmp_path, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+    # Replaced only once complete, so readers never map a half-written cache
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    with open(os.path.join(entity_dir, LATEST_FILE), 'w', encoding='utf-8') as f:
+        f.write(key + '\n')
+
+    print(f"Cache saved to {path} ({cache_format}, {len(rows)} rows)")
+    return path
+
+def save_cache(rows, entity, fieldnames, args, params):
+    """Writes the cache of an entity for the parsed generator arguments (--seed, --cache, --cache-dir)"""
+    key = cache_key(entity, args.seed, params)
+    return write_cache(rows, entity, fieldnames, key, args.cache, args.cache_dir, args.seed, params)
+
+class ColumnarCache:
+    """Read-only view of a cache directory; columns are memory-mapped on first use"""
+
+    def __init__(self, path):
+        if np is None:
+            raise ImportError("Reading the cache requires numpy (pip install numpy)")
+        with open(os.path.join(path, MANIFEST_FILE), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        self.path = path
+        self.format = self.manifest['format']
+        self.num_rows = self.manifest['num_rows']
+        self.id_column = self.manifest['id_column']
+        self.columns = [column['name'] for column in self.manifest['columns']]
+        self.kinds = {column['name']: column['kind'] for column in self.manifest['columns']}
+        self._arrays = {}
+        self._table = None
+
+        if self.format == 'arrow':
+            if pa is None:
+                raise ImportError("Reading an arrow cache requires pyarrow (pip install pyarrow)")
+            # Buffers of the table point into the mapped file (no copy, uncompressed)
+            self._table = pa.ipc.open_file(pa.memory_map(os.path.join(path, ARROW_FILE))).read_all()
+
+    def _load(self, filename):
+        if filename not in self._arrays:
+            self._arrays[filename] = np.load(os.path.join(self.path, filename), mmap_mode='r')
+        return self._arrays[filename]
+
+    def _mask(self, name):
+        if os.path.exists(os.path.join(self.path, f"{name}.mask.npy")):
+            return self._load(f"{name}.mask.npy")
+        return None
+
+    def ids(self):
+        """The ID column as a (sorted) NumPy array"""
+        if self._table is not None:
+            return self._table.column(self.id_column).to_numpy()
+        return self._load(f"{self.id_column}.npy")
+
+    def id_range(self, start_id=None, stop_id=None):
+        """Row range (start, stop) of the IDs in [start_id, stop_id), by binary search"""
+        ids = self.ids()
+        start = 0 if start_id is None else int(np.searchsorted(ids, start_id, side='left'))
+        stop = self.num_rows if stop_id is None else int(np.searchsorted(ids, stop_id, side='left'))
+        return start, max(start, stop)
+
+    def column(self, name, start=0, stop=None):
+        """
+        Values of rows [start, stop) of a column, without copies: a NumPy view
+        (fixed-width kinds of the numpy format) or an Arrow array
+        """
+        stop = self.num_rows if stop is None else stop
+        if self._table is not None:
+            return self._table.column(name).slice(start, stop - start)
+        if self.kinds[name] == 'string':
+            raise TypeError(f"{name} is a string column, use values() to decode it")
+        return self._load(f"{name}.npy")[start:stop]
+
+    def values(self, name, start=0, stop=None):
+        """Python values of rows [start, stop) of a column (None for nulls)"""
+        stop = self.num_rows if stop is None else stop
+        if self._table is not None:
+            return self._table.column(name).slice(start, stop - start).to_pylist()
+
+        if self.kinds[name] == 'string':
+            offsets = self._load(f"{name}.offsets.npy")[start:stop + 1]
+            # One decode of the whole block, then split at the character offsets
+            block = self._load(f"{name}.data.npy")[offsets[0]:offsets[-1]].tobytes()
+            relative = (offsets - offsets[0]).tolist()
+            values = [block[relative[i]:relative[i + 1]].decode('utf-8') for i in range(len(relative) - 1)]
+        else:
+            values = self._load(f"{name}.npy")[start:stop].tolist()
+
+        mask = self._mask(name)
+        if mask is not None:
+            values = [None if masked else value for value, masked in zip(values, mask[start:stop].tolist())]
+        return values
+
+    def slice(self, start_id=None, stop_id=None, columns=None):
+        """{column: values} of the rows with IDs in [start_id, stop_id)"""
+        start, stop = self.id_range(start_id, stop_id)
+        return {name: self.values(name, start, stop) for name in (columns or self.columns)}
+
+    def rows(self, start_id=None, stop_id=None, columns=None):
+        """Rows with IDs in [start_id, stop_id) as dicts, like the generators produce them"""
+        data = self.slice(start_id, stop_id, columns)
+        names = list(data)
+        return [dict(zip(names, values)) for values in zip(*data.values())]
+
+    def iter_batches(self, batch_size=100000):
+        """Yields the rows as lists of tuples (column order), batch_size rows at a time"""
+        for start in range(0, self.num_rows, batch_size):
+            stop = min(start + batch_size, self.num_rows)
+            yield list(zip(*(self.values(name, start, stop) for name in self.columns)))
+
+def latest_key(entity, cache_dir=CACHE_DIR):
+    """Key of the last cache written for an entity, or None"""
+    latest_file = os.path.join(cache_dir, entity, LATEST_FILE)
+    if not os.path.exists(latest_file):
+        return None
+    with open(latest_file, encoding='utf-8') as f:
+        return f.read().strip()
+
+def open_cache(entity, key=None, cache_dir=CACHE_DIR):
+    """Opens the cache of an entity (the latest one if no key is given)"""
+    key = key or latest_key(entity, cache_dir)
+    path = os.path.join(cache_dir, entity, key) if key else None
+    if path is None or not os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        raise FileNotFoundError(
+            f"No cache for {entity} in {cache_dir}. Run the generator with --cache first."
+        )
+    return ColumnarCache(path)
+
+def list_caches(cache_dir=CACHE_DIR):
+    """Manifests of every cache, as (entity, manifest, size in bytes, is latest)"""
+    caches = []
+    if not os.path.isdir(cache_dir):
+        return caches
+    for entity in sorted(os.listdir(cache_dir)):
+        entity_dir = os.path.join(cache_dir, entity)
+        if not os.path.isdir(entity_dir):
+            continue
+        latest = latest_key(entity, cache_dir)
+        for key in sorted(os.listdir(entity_dir)):
+            manifest_file = os.path.join(entity_dir, key, MANIFEST_FILE)
+            if not os.path.exists(manifest_file):
+                continue
+            with open(manifest_file, encoding='utf-8') as f:
+                manifest = json.load(f)
+            size = sum(
+                os.path.getsize(os.path.join(entity_dir, key, filename))
+                for filename in os.listdir(os.path.join(entity_dir, key))
+            )
+            caches.append((entity, manifest, size, key == latest))
+    return caches
+
+def add_cache_arguments(parser):
+    """Adds --seed, --cache and --cache-dir to a generator's argument parser"""
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Seed the random generators (same seed and settings give the same data and cache key)'
+    )
+    parser.add_argument(
+        '--cache',
+        nargs='?',
+        choices=CACHE_FORMATS,
+        const='numpy',
+        default=None,
+        help=f'Also write a memory-mapped columnar cache under {CACHE_DIR} (numpy: one .npy per column, default; arrow: Arrow IPC)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=CACHE_DIR,
+        help='Base directory of the columnar cache'
+    )
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='List the columnar caches or read an ID range from one'
+    )
+    parser.add_argument(
+        '-e', '--entity',
+        type=str,
+        default=None,
+        help='Entity to read (e.g. raw_orders); lists the caches if omitted'
+    )
+    parser.add_argument(
+        '--key',
+        type=str,
+        default=None,
+        help='Cache key (default: the latest cache of the entity)'
+    )
+    parser.add_argument(
+        '--ids',
+        nargs=2,
+        type=int,
+        metavar=('START', 'STOP'),
+        default=None,
+        help='ID range [START, STOP) to print (default: the first 5 rows)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=CACHE_DIR,
+        help=f'Base directory of the columnar cache (default: {CACHE_DIR})'
+    )
+
+    args = parser.parse_args()
+
+    if args.entity is None:
+        caches = list_caches(args.cache_dir)
+        print(f"\n{'='*50}")
+        print("🗄️  COLUMNAR CACHE")
+        print(f"{'='*50}")
+        if not caches:
+            print(f"No caches in {args.cache_dir}")
+            sys.exit(1)
+        for entity, manifest, size, is_latest in caches:
+            marker = ' (latest)' if is_latest else ''
+            print(f"{entity:<14} {manifest['key']}  {manifest['format']:<6} {manifest['num_rows']:>10} rows "
+                  f"{size / 1e6:>9.1f} MB  seed={manifest['seed']}{marker}")
+        return
+
+    start = time.perf_counter()
+    cache = open_cache(args.entity, args.key, args.cache_dir)
+    if args.ids:
+        rows = cache.rows(*args.ids)
+    else:
+        first_ids = cache.ids()[:5]
+        rows = cache.rows(int(first_ids[0]), int(first_ids[-1]) + 1) if len(first_ids) else []
+    seconds = time.perf_counter() - start
+
+    for row in rows:
+        print(row)
+    print(f"\n{len(rows)} of {cache.num_rows} rows of {cache.path} read in {seconds * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,11 @@ import os
 # Project root directory (relative to scripts directory)
 PROJECT_ROOT = os.path.join(os.path.dirname(__file__), '..')
 
+# dbt project directory
+DBT_PROJECT_DIR = os.path.join(PROJECT_ROOT, 'jaffle_shop')
+
 # Seeds directory path
-SEEDS_DIR = os.path.join(PROJECT_ROOT, 'jaffle_shop', 'seeds', 'jaffle-data')
+SEEDS_DIR = os.path.join(DBT_PROJECT_DIR, 'seeds', 'jaffle-data')
 
 # Output file paths
 CUSTOMERS_FILE = os.path.join(SEEDS_DIR, 'raw_customers.csv')
@@ -18,11 +21,37 @@ PRODUCTS_FILE = os.path.join(SEEDS_DIR, 'raw_products.csv')
 ORDERS_FILE = os.path.join(SEEDS_DIR, 'raw_orders.csv')
 ITEMS_FILE = os.path.join(SEEDS_DIR, 'raw_items.csv')
 
+# Partitioned output directory (kept outside seeds so dbt does not load
+# every partition file as a separate seed)
+PARTITIONS_DIR = os.path.join(PROJECT_ROOT, 'data', 'partitions')
+
+# Memory-mapped columnar cache of generated entities (one directory per
+# entity and cache key, see columnar_cache.py)
+CACHE_DIR = os.path.join(PROJECT_ROOT, 'data', 'cache')
+
+# Rows per part file in partitioned mode
+DEFAULT_PART_SIZE = 100000
+
+# SQLite database of the dbt profile (profiles.yml path, resolved from the dbt project directory)
+DATABASE_FILE = os.path.join(DBT_PROJECT_DIR, 'jaffle_shop', 'db', 'jaffle_shop.db')
+
+# Query-plan baselines (one JSON file per adapter), written by query_plans.py --update-baseline
+QUERY_PLANS_DIR = os.path.join(DBT_PROJECT_DIR, 'query_plans')
+
+# Change-data-capture (CDC) stream
+# Batch files are written to CDC_DIR and appended to the change-log seeds
+CDC_DIR = os.path.join(PROJECT_ROOT, 'data', 'cdc')
+CUSTOMERS_CHANGES_FILE = os.path.join(SEEDS_DIR, 'raw_customers_changes.csv')
+PRODUCTS_CHANGES_FILE = os.path.join(SEEDS_DIR, 'raw_products_changes.csv')
+ORDERS_CHANGES_FILE = os.path.join(SEEDS_DIR, 'raw_orders_changes.csv')
+
 # Data generation defaults
 DEFAULT_NUM_CUSTOMERS = 3000
 DEFAULT_NUM_PRODUCTS = 1000
 DEFAULT_NUM_ORDERS = 10000
 DEFAULT_NUM_ITEMS = 20000
+DEFAULT_CDC_BATCHES = 1
+DEFAULT_CDC_BATCH_SIZE = 500
 
 # Data quality problem percentages
 PROBLEM_PERCENTAGES = {
@@ -74,6 +103,37 @@ DATE_RANGES = {
     }
 }
 
+# Give generated timestamps a random time of day instead of 00:00:00
+# (can also be enabled per run with --intraday-times)
+INTRADAY_TIMES = False
+
+# Daily order volume curve for time-series generation
+# Each day's volume is proportional to:
+#   weekday weight * annual seasonality * growth * spike multiplier * noise
+ORDER_VOLUME_PROFILE = {
+    # Monday to Sunday
+    'weekday_weights': [0.95, 0.90, 0.95, 1.00, 1.15, 1.25, 1.10],
+    # Annual seasonality (sine wave peaking on the given day of year)
+    'annual_amplitude': 0.25,
+    'annual_peak_day': 345,
+    # Compound growth of volume per year
+    'yearly_growth': 0.20,
+    # Fixed-date spikes ('MM-DD': multiplier)
+    'spikes': {
+        '03-15': 1.8,  # Consumer day
+        '05-12': 1.5,  # Mother's day week
+        '12-23': 2.0,  # Christmas rush
+        '12-24': 1.6
+    },
+    # Black Friday (day after the fourth Thursday of November), the weekend
+    # after it and Cyber Monday
+    'black_friday_multiplier': 6.0,
+    'black_friday_weekend_multiplier': 3.0,
+    'cyber_monday_multiplier': 3.5,
+    # Random day-to-day variation (fraction of the daily volume)
+    'noise': 0.10
+}
+
 # Value ranges for problems
 VALUE_RANGES = {
     'negative_amount': (-1000.0, -1.0),
@@ -136,6 +196,24 @@ PAYMENT_METHODS = [
     'credit_card', 'debit_card', 'pix', 'boleto', 'paypal', 'cash'
 ]
 
+# Allowed order status transitions in the CDC stream
+# (orders with missing status are treated as pending)
+ORDER_STATUS_TRANSITIONS = {
+    'pending': ['processing', 'cancelled'],
+    'processing': ['shipped', 'cancelled'],
+    'shipped': ['delivered', 'returned'],
+    'delivered': ['returned'],
+    'cancelled': [],
+    'returned': []
+}
+
+# Share of each operation in a CDC batch
+CDC_OPERATION_MIX = {
+    'insert': 0.20,
+    'update': 0.70,
+    'delete': 0.10
+}
+
 # Invalid data examples for testing
 INVALID_DATA_EXAMPLES = {
     'emails': [
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Fast date and timestamp generation for the generator scripts
+Each date range is parsed once; timestamps are drawn in bulk as integer second
+offsets and formatted through precomputed day and time-of-day lookup tables
+"""
+
+import random
+from datetime import date, timedelta
+from config import DATE_RANGES, INTRADAY_TIMES
+
+SECONDS_PER_DAY = 86400
+
+# Rows drawn per call in the iter_* helpers
+DEFAULT_BLOCK_SIZE = 10000
+
+# 'HH:MM:' for every minute of the day and 'SS' for every second of a minute
+_MINUTE_STRINGS = [f"{minute // 60:02d}:{minute % 60:02d}:" for minute in range(1440)]
+_SECOND_STRINGS = [f"{second:02d}" for second in range(60)]
+
+class DateRange:
+    """
+    Inclusive range of days with a lookup table of their 'YYYY-MM-DD' strings
+
+    Timestamps are seconds since the start of the first day. Without intraday
+    times they are whole days, so the time part is always '00:00:00'.
+    """
+
+    def __init__(self, start, end, intraday_times=INTRADAY_TIMES):
+        self.start = date.fromisoformat(start)
+        self.end = date.fromisoformat(end)
+        if self.end < self.start:
+            raise ValueError(f"Date range ends before it starts: {start} - {end}")
+        self.num_days = (self.end - self.start).days + 1
+        self.intraday_times = intraday_times
+        self.day_strings = [(self.start + timedelta(days=n)).isoformat() for n in range(self.num_days)]
+        # Timestamps are drawn in units of one second or one whole day
+        self.unit = 1 if intraday_times else SECONDS_PER_DAY
+        self.num_units = self.num_days * SECONDS_PER_DAY // self.unit
+
+    def format(self, seconds):
+        """'YYYY-MM-DD HH:MM:SS' of a timestamp"""
+        day, second = divmod(seconds, SECONDS_PER_DAY)
+        minute, second = divmod(second, 60)
+        return f"{self.day_strings[day]} {_MINUTE_STRINGS[minute]}{_SECOND_STRINGS[second]}"
+
+    def day_offset(self, day):
+        """Index of a date in the range"""
+        return (day - self.start).days
+
+    def random_timestamps(self, n):
+        """n timestamps uniformly distributed over the range"""
+        num_units = self.num_units
+        unit = self.unit
+        rand = random.random
+        return [int(rand() * num_units) * unit for _ in range(n)]
+
+    def later_timestamps(self, timestamps):
+        """One timestamp between each given timestamp and the end of the range"""
+        last = self.num_units * self.unit
+        unit = self.unit
+        rand = random.random
+        return [
+            timestamp + int(rand() * ((last - timestamp) // unit)) * unit
+            for timestamp in timestamps
+        ]
+
+    def day_timestamps(self, day_offset, n):
+        """n sorted timestamps on one day (all at midnight without intraday times)"""
+        day_start = day_offset * SECONDS_PER_DAY
+        if not self.intraday_times:
+            return [day_start] * n
+        rand = random.random
+        return sorted(day_start + int(rand() * SECONDS_PER_DAY) for _ in range(n))
+
+    def iter_created_updated(self, n, block_size=DEFAULT_BLOCK_SIZE):
+        """Yields n (created_at, updated_at) string pairs with updated_at >= created_at"""
+        fmt = self.format
+        for block_start in range(0, n, block_size):
+            created = self.random_timestamps(min(block_size, n - block_start))
+            updated = self.later_timestamps(created)
+            for created_at, updated_at in zip(created, updated):
+                yield fmt(created_at), fmt(updated_at)
+
+    def iter_created(self, n, block_size=DEFAULT_BLOCK_SIZE):
+        """Yields n created_at strings"""
+        fmt = self.format
+        for block_start in range(0, n, block_size):
+            for created_at in self.random_timestamps(min(block_size, n - block_start)):
+                yield fmt(created_at)
+
+# Intra-day times setting used by date_range() (see configure())
+_intraday_times = INTRADAY_TIMES
+_ranges = {}
+
+def configure(intraday_times=INTRADAY_TIMES):
+    """Sets whether timestamps get random times of day instead of 00:00:00"""
+    global _intraday_times
+    _intraday_times = intraday_times
+
+def date_range(entity, end=None):
+    """The (cached) DateRange of DATE_RANGES[entity], optionally up to another end date"""
+    end = end or DATE_RANGES[entity]['end']
+    key = (entity, end, _intraday_times)
+    if key not in _ranges:
+        _ranges[key] = DateRange(DATE_RANGES[entity]['start'], end, _intraday_times)
+    return _ranges[key]
+
+def created_range(entity):
+    """
+    DateRange of the uniformly drawn created_at/updated_at: from the configured
+    start up to today, as fake.date_between_dates drew them (time-series orders
+    follow the configured end instead)
+    """
+    return date_range(entity, date.today().isoformat())
+
+def add_date_arguments(parser):
+    """Adds --intraday-times to an argument parser"""
+    parser.add_argument(
+        '--intraday-times',
+        action='store_true',
+        default=INTRADAY_TIMES,
+        help=f'Give timestamps a random time of day instead of 00:00:00 (default: {INTRADAY_TIMES})'
+    )
+
+def configure_dates_from_args(args):
+    """Applies the parsed --intraday-times argument"""
+    configure(args.intraday_times)
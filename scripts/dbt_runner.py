@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Wrapper around dbt that keeps the parsed manifest warm between invocations
+Measures parse time vs execution time and can run a selection without re-parsing
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+import argparse
+from dbt.cli.flags import Flags
+from dbt.cli.main import cli, dbtRunner
+from dbt.config.runtime import RuntimeConfig
+from dbt.flags import set_flags
+from dbt.parser.manifest import ManifestLoader
+from config import DBT_PROJECT_DIR
+
+# Partial parsing state written by dbt on every parse
+PARTIAL_PARSE_FILE = os.path.join('target', 'partial_parse.msgpack')
+
+# Project files that invalidate the cached manifest when changed
+PROJECT_FILES = ['dbt_project.yml', 'profiles.yml', 'packages.yml']
+PROJECT_PATHS = ['models', 'macros', 'tests', 'seeds', 'snapshots', 'analyses', 'dbt_packages']
+
+# dbt options that change the parse result (they are part of dbt's state check)
+PARSE_OPTIONS = ['--vars', '--target', '-t', '--profile']
+
+def parse_options(dbt_args):
+    """The options of a dbt command that affect parsing (--vars, --target, --profile)"""
+    options = []
+    args = iter(dbt_args)
+    for arg in args:
+        name = arg.split('=', 1)[0]
+        if name in PARSE_OPTIONS:
+            options.append(arg)
+            if '=' not in arg:
+                options.append(next(args, ''))
+    return options
+
+def cache_is_fresh(project_dir):
+    """True if partial_parse.msgpack is newer than every project file"""
+    cache_file = os.path.join(project_dir, PARTIAL_PARSE_FILE)
+    if not os.path.exists(cache_file):
+        return False
+
+    cache_mtime = os.path.getmtime(cache_file)
+    for name in PROJECT_FILES:
+        path = os.path.join(project_dir, name)
+        if os.path.exists(path) and os.path.getmtime(path) > cache_mtime:
+            return False
+
+    for name in PROJECT_PATHS:
+        for root, _, files in os.walk(os.path.join(project_dir, name)):
+            for filename in files:
+                if os.path.getmtime(os.path.join(root, filename)) > cache_mtime:
+                    return False
+
+    return True
+
+def saved_manifest(project_dir, options=None):
+    """
+    The manifest of partial_parse.msgpack if dbt's state check passes for these
+    options (same --vars, target, profile, connection, env vars and dbt version),
+    otherwise None
+    """
+    args = ['--profiles-dir', project_dir] + (options or [])
+    context = cli.commands['parse'].make_context('parse', args, parent=cli.make_context(cli.name, ['parse'] + args))
+    flags = Flags(context)
+    set_flags(flags)
+    config = RuntimeConfig.from_args(flags)
+    # The loader reads the saved manifest and rejects it when the state check differs
+    return ManifestLoader(config, config.load_dependencies()).saved_manifest
+
+def load_manifest(project_dir, reuse_manifest=False, options=None):
+    """
+    Returns (manifest, source, seconds)
+
+    With reuse_manifest the manifest is read from partial_parse.msgpack when no
+    project file changed since and it was parsed with the same state (options),
+    otherwise dbt parses the project with the options (using partial parsing).
+    """
+    options = options or []
+    start = time.perf_counter()
+
+    if reuse_manifest and cache_is_fresh(project_dir):
+        manifest = saved_manifest(project_dir, options)
+        if manifest is not None:
+            return manifest, 'cache', time.perf_counter() - start
+        print("Cached manifest was parsed with other --vars/target/profile/env, parsing again")
+
+    result = dbtRunner().invoke(['parse', '--quiet', '--profiles-dir', project_dir] + options)
+    if not result.success:
+        raise RuntimeError(f"dbt parse failed: {result.exception}")
+    return result.result, 'parse', time.perf_counter() - start
+
+def run_dbt(dbt_args, project_dir, reuse_manifest=False, repeat=1):
+    """Runs a dbt command (repeatedly) with a single parse and reports the timings"""
+    manifest, source, parse_seconds = load_manifest(project_dir, reuse_manifest, parse_options(dbt_args))
+    runner = dbtRunner(manifest=manifest)
+
+    timings = []
+    success = True
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = runner.invoke(dbt_args + ['--profiles-dir', project_dir])
+        timings.append(time.perf_counter() - start)
+        success = success and result.success
+
+    print(f"\n{'='*50}")
+    print("⏱️  DBT TIMINGS")
+    print(f"{'='*50}")
+    print(f"Command: dbt {' '.join(dbt_args)}")
+    print(f"Parse time: {parse_seconds:.2f}s" + (" (manifest loaded from cache)" if source == 'cache' else ""))
+    for n, seconds in enumerate(timings, 1):
+        print(f"Execution time (run {n}): {seconds:.2f}s")
+    total = parse_seconds + sum(timings)
+    print(f"Parse share of wall time: {parse_seconds / total:.0%}")
+
+    return success
+
+def time_subprocess(cmd):
+    """Wall time of a command in a new process"""
+    start = time.perf_counter()
+    subprocess.run(cmd, capture_output=True, check=True)
+    return time.perf_counter() - start
+
+def benchmark(dbt_args, project_dir, rounds=3):
+    """Compares cold, warm (partial parse) and cached-manifest startup"""
+    dbt_cmd = ['dbt'] + dbt_args + ['--profiles-dir', project_dir]
+    results = {
+        'cold (no partial parse)': [],
+        'warm (partial parse)': [],
+        'cached manifest (no parse)': []
+    }
+
+    # Make sure partial_parse.msgpack exists and is up to date (for the same options)
+    options = parse_options(dbt_args)
+    subprocess.run(['dbt', 'parse', '--profiles-dir', project_dir] + options, capture_output=True, check=True)
+
+    for n in range(rounds):
+        print(f"Round {n + 1}/{rounds}...")
+        results['cold (no partial parse)'].append(time_subprocess(dbt_cmd + ['--no-partial-parse']))
+        results['warm (partial parse)'].append(time_subprocess(dbt_cmd))
+
+        manifest, _, load_seconds = load_manifest(project_dir, reuse_manifest=True, options=options)
+        start = time.perf_counter()
+        dbtRunner(manifest=manifest).invoke(dbt_args + ['--quiet', '--profiles-dir', project_dir])
+        results['cached manifest (no parse)'].append(load_seconds + time.perf_counter() - start)
+
+    print(f"\n{'='*50}")
+    print("📊 STARTUP BENCHMARK")
+    print(f"{'='*50}")
+    print(f"Command: dbt {' '.join(dbt_args)} ({rounds} rounds, median)")
+    cold = statistics.median(results['cold (no partial parse)'])
+    for mode, timings in results.items():
+        median = statistics.median(timings)
+        print(f"  {mode:<28} {median:6.2f}s  ({cold / median:.1f}x vs cold)")
+    print("\nCold and warm include interpreter startup; the cached manifest runs in-process.")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Run dbt with a warm manifest and report parse vs execution time'
+    )
+    parser.add_argument(
+        '--project-dir',
+        type=str,
+        default=DBT_PROJECT_DIR,
+        help=f'dbt project directory (default: {DBT_PROJECT_DIR})'
+    )
+    parser.add_argument(
+        '--reuse-manifest',
+        action='store_true',
+        help='Load the manifest from target/partial_parse.msgpack without re-parsing when it is up to date for the same --vars/--target'
+    )
+    parser.add_argument(
+        '--repeat',
+        type=int,
+        default=1,
+        help='Run the command several times with a single parse (default: 1)'
+    )
+    parser.add_argument(
+        '--benchmark',
+        action='store_true',
+        help='Compare cold, warm and cached-manifest startup for the command'
+    )
+    parser.add_argument(
+        '--rounds',
+        type=int,
+        default=3,
+        help='Benchmark rounds (default: 3)'
+    )
+    parser.add_argument(
+        'dbt_args',
+        nargs=argparse.REMAINDER,
+        help='dbt command and arguments (default: ls)'
+    )
+
+    args = parser.parse_args()
+    dbt_args = args.dbt_args or ['ls']
+    project_dir = os.path.abspath(args.project_dir)
+
+    # Run from the project directory, like init_project.sh does
+    os.chdir(project_dir)
+
+    if args.benchmark:
+        benchmark(dbt_args, project_dir, args.rounds)
+    elif not run_dbt(dbt_args, project_dir, args.reuse_manifest, args.repeat):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,22 @@ Generates data that includes problems to test the problematic_orders model
 import subprocess
 import sys
 import os
+import argparse
 from config import (
     DEFAULT_NUM_CUSTOMERS, DEFAULT_NUM_PRODUCTS, 
-    DEFAULT_NUM_ORDERS, DEFAULT_NUM_ITEMS
+    DEFAULT_NUM_ORDERS, DEFAULT_NUM_ITEMS,
+    PROJECT_ROOT, PARTITIONS_DIR, CACHE_DIR,
+    CUSTOMERS_FILE, PRODUCTS_FILE, ORDERS_FILE, ITEMS_FILE
 )
+from pipeline import output_filename
+
+# Seed file of each generated entity
+ENTITY_FILES = {
+    'raw_customers': CUSTOMERS_FILE,
+    'raw_products': PRODUCTS_FILE,
+    'raw_orders': ORDERS_FILE,
+    'raw_items': ITEMS_FILE
+}
 
 def run_script(script_name, args=None):
     """Executes a Python script and returns the result"""
@@ -44,9 +56,87 @@ def run_script(script_name, args=None):
             print(e.stderr)
         return False
 
+def generated_outputs(args):
+    """Paths written by the scripts for the selected mode and format (relative to the project root)"""
+    outputs = []
+    for entity, seed_file in ENTITY_FILES.items():
+        # --pipeline takes precedence over --partitioned, like in the script arguments
+        if args.pipeline:
+            outputs.append(output_filename(seed_file, args.format))
+        elif args.partitioned:
+            outputs.append(os.path.join(PARTITIONS_DIR, entity, f"part-*.{args.format}"))
+        else:
+            outputs.append(seed_file)
+        if args.cache:
+            outputs.append(os.path.join(CACHE_DIR, entity, f"<key> ({args.cache})"))
+    return [os.path.relpath(path, PROJECT_ROOT) for path in outputs]
+
 def main():
     """Main function that executes all scripts"""
     
+    parser = argparse.ArgumentParser(
+        description='Generate all CSV data using the individual scripts'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Run each script in pipeline mode (generation, encoding and writes overlapped)'
+    )
+    parser.add_argument(
+        '--partitioned',
+        action='store_true',
+        help='Write part files under data/partitions instead of the seed files (load them with load_partitions.py)'
+    )
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Output format in pipeline and partitioned mode (default: csv)'
+    )
+    parser.add_argument(
+        '--intraday-times',
+        action='store_true',
+        help='Give timestamps a random time of day instead of 00:00:00'
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print the timing report of each script'
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=None,
+        help='Seed the random generators of every script (reproducible data)'
+    )
+    parser.add_argument(
+        '--cache',
+        nargs='?',
+        choices=['numpy', 'arrow'],
+        const='numpy',
+        default=None,
+        help='Also write the memory-mapped columnar cache of each entity (not in pipeline mode)'
+    )
+    
+    args = parser.parse_args()
+    if args.pipeline and args.cache:
+        parser.error('--pipeline cannot be combined with --cache')
+    
+    # Extra arguments passed to every script
+    extra_args = []
+    if args.pipeline:
+        extra_args += ['--pipeline', '--format', args.format]
+    elif args.partitioned:
+        extra_args += ['--partitioned', '--format', args.format]
+    if args.intraday_times:
+        extra_args.append('--intraday-times')
+    if args.profile:
+        extra_args.append('--profile')
+    if args.seed is not None:
+        extra_args += ['--seed', str(args.seed)]
+    if args.cache:
+        extra_args += ['--cache', args.cache]
+    
     print("🚀 Starting generation of all data...")
     print("This script will generate data with problems to test problematic_orders")
     
@@ -59,16 +149,16 @@ def main():
     
     # Execute scripts in sequence
     scripts_to_run = [
-        ('generate_customer_data.py', config['customers']),
-        ('generate_products_data.py', config['products']),
-        ('generate_items_data.py', config['orders'])
+        ('generate_customer_data.py', config['customers'] + extra_args),
+        ('generate_products_data.py', config['products'] + extra_args),
+        ('generate_items_data.py', config['orders'] + extra_args)
     ]
     
     success_count = 0
     total_scripts = len(scripts_to_run)
     
-    for script_name, args in scripts_to_run:
-        if run_script(script_name, args):
+    for script_name, script_args in scripts_to_run:
+        if run_script(script_name, script_args):
             success_count += 1
         else:
             print(f"⚠️  Failed to execute {script_name}")
@@ -82,10 +172,8 @@ def main():
     if success_count == total_scripts:
         print("🎉 All data was generated successfully!")
         print("\n📁 Generated files:")
-        print("  - seeds/jaffle-data/raw_customers.csv")
-        print("  - seeds/jaffle-data/raw_products.csv")
-        print("  - seeds/jaffle-data/raw_orders.csv")
-        print("  - seeds/jaffle-data/raw_items.csv")
+        for path in generated_outputs(args):
+            print(f"  - {path}")
         print("\n🔍 Data includes problems to test:")
         print("  - Orders with negative, zero or very high values")
         print("  - Orders with future or missing dates")
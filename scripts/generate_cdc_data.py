@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Script to generate a change-data-capture (CDC) stream for customers, products and orders
+Reads the current state from the seed files (plus all previous changes) and emits
+append-only batches of inserts, updates and deletes consumed by the dbt snapshots
+"""
+
+import csv
+import random
+import os
+from datetime import datetime, timedelta
+import argparse
+from config import (
+    CUSTOMERS_FILE, PRODUCTS_FILE, ORDERS_FILE, CUSTOMERS_CHANGES_FILE,
+    PRODUCTS_CHANGES_FILE, ORDERS_CHANGES_FILE, CDC_DIR, DEFAULT_CDC_BATCHES,
+    DEFAULT_CDC_BATCH_SIZE, CDC_OPERATION_MIX, ORDER_STATUS_TRANSITIONS,
+    BRAZILIAN_DATA, DATE_RANGES
+)
+from generate_customer_data import fake, generate_customer_data, generate_zip_code
+from generate_products_data import generate_product_data
+from generate_items_data import build_order
+from profiling import profiler, add_profile_arguments, configure_from_args
+
+# Columns added to every change record
+CDC_COLUMNS = ['change_id', 'batch_id', 'operation', 'changed_at']
+
+# Seed file and change log of each entity
+ENTITIES = {
+    'customers': {
+        'seed_file': CUSTOMERS_FILE,
+        'changes_file': CUSTOMERS_CHANGES_FILE
+    },
+    'products': {
+        'seed_file': PRODUCTS_FILE,
+        'changes_file': PRODUCTS_CHANGES_FILE
+    },
+    'orders': {
+        'seed_file': ORDERS_FILE,
+        'changes_file': ORDERS_CHANGES_FILE
+    }
+}
+
+class EntityState:
+    """Current rows of an entity, rebuilt from the seed file and the change log"""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = {}
+        self.live_ids = []
+        self.positions = {}
+        self.fieldnames = []
+        self.max_id = 0
+        self.last_change_id = 0
+        self.last_batch_id = 0
+        self.last_changed_at = None
+
+    def add(self, row):
+        row_id = int(row['id'])
+        if row_id not in self.positions:
+            self.positions[row_id] = len(self.live_ids)
+            self.live_ids.append(row_id)
+        self.rows[row_id] = row
+        self.max_id = max(self.max_id, row_id)
+
+    def remove(self, row_id):
+        # Swap with the last id so deletes stay O(1)
+        position = self.positions.pop(row_id)
+        last_id = self.live_ids.pop()
+        if last_id != row_id:
+            self.live_ids[position] = last_id
+            self.positions[last_id] = position
+        del self.rows[row_id]
+
+    def random_id(self):
+        return random.choice(self.live_ids)
+
+def load_state(name):
+    """Loads the seed file and replays the change log of an entity"""
+    entity = ENTITIES[name]
+    state = EntityState(name)
+
+    if not os.path.exists(entity['seed_file']):
+        raise FileNotFoundError(
+            f"{entity['seed_file']} not found. Run generate_all_data.py first."
+        )
+
+    with open(entity['seed_file'], newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        state.fieldnames = list(reader.fieldnames)
+        for row in reader:
+            state.add(row)
+
+    if os.path.exists(entity['changes_file']):
+        with open(entity['changes_file'], newline='', encoding='utf-8') as csvfile:
+            for change in csv.DictReader(csvfile):
+                row = {column: change[column] for column in state.fieldnames}
+                if change['operation'] == 'delete':
+                    # Ids are never reused, so the deleted id still counts for max_id
+                    state.max_id = max(state.max_id, int(row['id']))
+                    if int(row['id']) in state.rows:
+                        state.remove(int(row['id']))
+                else:
+                    state.add(row)
+                state.last_change_id = int(change['change_id'])
+                state.last_batch_id = int(change['batch_id'])
+                state.last_changed_at = change['changed_at']
+
+    return state
+
+def new_customer(row_id, timestamp):
+    """Generates a new customer for an insert"""
+    customer = generate_customer_data(1)[0]
+    customer['id'] = row_id
+    customer['created_at'] = timestamp
+    customer['updated_at'] = timestamp
+    return customer
+
+def update_customer(customer, timestamp):
+    """Changes the address or the email of a customer"""
+    customer = dict(customer)
+    if random.random() < 0.5:
+        customer['address'] = fake.street_address()
+        customer['city'] = random.choice(BRAZILIAN_DATA['cities'])
+        customer['state'] = random.choice(BRAZILIAN_DATA['states'])
+        customer['zip_code'] = generate_zip_code()
+    else:
+        customer['email'] = f"{customer['first_name'].lower()}.{customer['last_name'].lower()}@{fake.free_email_domain()}"
+    customer['updated_at'] = timestamp
+    return customer
+
+def new_product(row_id, timestamp):
+    """Generates a new product for an insert"""
+    product = generate_product_data(1)[0]
+    product['id'] = row_id
+    product['created_at'] = timestamp
+    product['updated_at'] = timestamp
+    return product
+
+def update_product(product, timestamp):
+    """Changes the price of a product (between -20% and +20%)"""
+    product = dict(product)
+    try:
+        price = float(product['price'])
+    except ValueError:
+        price = 0
+
+    if price > 0:
+        product['price'] = round(price * random.uniform(0.8, 1.2), 2)
+    else:
+        # Fix missing or invalid prices
+        product['price'] = round(random.uniform(10.0, 1000.0), 2)
+    product['updated_at'] = timestamp
+    return product
+
+def new_order(row_id, timestamp):
+    """Generates a new pending order for an insert"""
+    order = build_order(row_id, timestamp)
+    order['status'] = 'pending'
+    order['total_amount'] = round(random.uniform(10.0, 2500.0), 2)
+    return order
+
+def update_order(order, timestamp):
+    """Moves an order to its next status, or returns None if the status is final"""
+    transitions = ORDER_STATUS_TRANSITIONS.get(order['status'] or 'pending', [])
+    if not transitions:
+        return None
+    order = dict(order)
+    order['status'] = random.choice(transitions)
+    return order
+
+GENERATORS = {
+    'customers': (new_customer, update_customer),
+    'products': (new_product, update_product),
+    'orders': (new_order, update_order)
+}
+
+def generate_cdc_batch(state, batch_size):
+    """Generates one batch of changes and applies it to the state"""
+    new_row, update_row = GENERATORS[state.name]
+    operations = list(CDC_OPERATION_MIX)
+    weights = list(CDC_OPERATION_MIX.values())
+
+    if state.last_changed_at:
+        batch_start = datetime.fromisoformat(state.last_changed_at[:10]) + timedelta(days=1)
+    else:
+        batch_start = datetime.fromisoformat(DATE_RANGES[state.name]['end']) + timedelta(days=1)
+
+    state.last_batch_id += 1
+    changes = []
+
+    for n in range(batch_size):
+        # Changes are spread over the day of the batch
+        timestamp = (batch_start + timedelta(seconds=n * 86400 // batch_size)).strftime('%Y-%m-%d %H:%M:%S')
+        operation = random.choices(operations, weights)[0]
+
+        if operation != 'insert' and not state.live_ids:
+            operation = 'insert'
+
+        if operation == 'insert':
+            row = new_row(state.max_id + 1, timestamp)
+            state.add(row)
+        elif operation == 'update':
+            # Retry a few times when the picked row has no possible change
+            row = None
+            for _ in range(5):
+                row = update_row(state.rows[state.random_id()], timestamp)
+                if row is not None:
+                    break
+            if row is None:
+                continue
+            state.add(row)
+        else:
+            row = state.rows[state.random_id()]
+            state.remove(int(row['id']))
+
+        state.last_change_id += 1
+        change = {
+            'change_id': state.last_change_id,
+            'batch_id': state.last_batch_id,
+            'operation': operation,
+            'changed_at': timestamp
+        }
+        change.update({column: row.get(column) for column in state.fieldnames})
+        changes.append(change)
+
+    if changes:
+        state.last_changed_at = changes[-1]['changed_at']
+
+    return changes
+
+def save_batch(state, changes, cdc_dir=CDC_DIR):
+    """Writes the batch file and appends it to the change-log seed"""
+
+    if not changes:
+        print("No data to save!")
+        return
+
+    fieldnames = CDC_COLUMNS + state.fieldnames
+    batch_dir = os.path.join(cdc_dir, state.name)
+    batch_file = os.path.join(batch_dir, f"batch_{state.last_batch_id:06d}.csv")
+    changes_file = ENTITIES[state.name]['changes_file']
+
+    # Create directory if it doesn't exist
+    os.makedirs(batch_dir, exist_ok=True)
+
+    with open(batch_file, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(changes)
+
+    # Append-only change log (header only when the file is new)
+    write_header = not os.path.exists(changes_file)
+    with open(changes_file, 'a', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(changes)
+
+    print(f"Batch {state.last_batch_id} saved to {batch_file}")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Generate a CDC stream (inserts, updates and deletes) for the generated seeds'
+    )
+    parser.add_argument(
+        '-b', '--batches',
+        type=int,
+        default=DEFAULT_CDC_BATCHES,
+        help=f'Number of batches to generate (default: {DEFAULT_CDC_BATCHES})'
+    )
+    parser.add_argument(
+        '-n', '--batch-size',
+        type=int,
+        default=DEFAULT_CDC_BATCH_SIZE,
+        help=f'Changes per batch and entity (default: {DEFAULT_CDC_BATCH_SIZE})'
+    )
+    parser.add_argument(
+        '-e', '--entities',
+        nargs='+',
+        choices=list(ENTITIES),
+        default=list(ENTITIES),
+        help='Entities to generate changes for (default: all)'
+    )
+    parser.add_argument(
+        '--cdc-dir',
+        type=str,
+        default=CDC_DIR,
+        help=f'Directory for batch files (default: {CDC_DIR})'
+    )
+    add_profile_arguments(parser)
+
+    args = parser.parse_args()
+    configure_from_args(args)
+
+    for name in args.entities:
+        print(f"\n=== {name} ===")
+        with profiler.stage('load state') as timer:
+            state = load_state(name)
+            timer.rows = len(state.rows) + state.last_change_id
+        print(f"Current rows: {len(state.rows)}, previous changes: {state.last_change_id}")
+
+        counts = {operation: 0 for operation in CDC_OPERATION_MIX}
+        for _ in range(args.batches):
+            with profiler.stage(f'generate {name}') as timer:
+                changes = generate_cdc_batch(state, args.batch_size)
+                timer.rows = len(changes)
+            with profiler.stage('write batches', rows=len(changes)):
+                save_batch(state, changes, args.cdc_dir)
+            for change in changes:
+                counts[change['operation']] += 1
+
+        print(f"Changes generated: {counts}")
+        print(f"Total changes in log: {state.last_change_id}")
+
+    # The snapshots read the current-state tables, so these are rebuilt in between
+    print("\nLoad the changes with:")
+    print("  dbt seed")
+    print("  dbt run --select stg_customers_current stg_products_current --vars '{enable_cdc: true}'")
+    print("  dbt snapshot --vars '{enable_cdc: true}'")
+
+    profiler.report()
+
+if __name__ == "__main__":
+    main()
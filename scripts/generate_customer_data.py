@@ -7,17 +7,30 @@ Includes intentional duplicates for testing duplicate detection
 
 import csv
 import random
-from datetime import datetime, timedelta
 from faker import Faker
 import argparse
 from config import (
     CUSTOMERS_FILE, DEFAULT_NUM_CUSTOMERS, PROBLEM_PERCENTAGES,
-    DATE_RANGES, BRAZILIAN_DATA, INVALID_DATA_EXAMPLES
+    BRAZILIAN_DATA, INVALID_DATA_EXAMPLES
 )
+from date_engine import created_range, add_date_arguments, configure_dates_from_args
+from partitions import save_partitioned, add_partition_arguments
+from profiling import profiler, add_profile_arguments, configure_from_args
+from columnar_cache import add_cache_arguments, seed_generators, save_cache
+from pipeline import DEFAULT_CHUNK_SIZE, DEFAULT_QUEUE_SIZE, FILE_FORMATS, chunked, run_pipeline
 
 # Configure Faker for Brazilian Portuguese
 fake = Faker(['pt_BR'])
 
+# Output columns
+CUSTOMERS_FIELDNAMES = [
+    'id', 'first_name', 'last_name', 'email', 'phone', 'address',
+    'city', 'state', 'zip_code', 'created_at', 'updated_at'
+]
+
+# Parquet types of the numeric columns (pipeline mode writes chunks, so they are declared, not inferred)
+CUSTOMERS_TYPES = {'id': 'int64'}
+
 def generate_phone():
     """Generates a valid Brazilian phone number"""
     # Formats: (11) 99999-9999 or 11999999999
@@ -159,27 +172,25 @@ def create_duplicate_variations(base_customer, duplicate_type):
     else:
         return None
 
-def generate_customer_data(num_records=DEFAULT_NUM_CUSTOMERS):
-    """Generates customer data with intentional duplicates"""
+def iter_customer_data(num_records=DEFAULT_NUM_CUSTOMERS):
+    """Yields customer rows one by one (base customers first, then duplicates)"""
     
-    customers = []
     base_customers = []
     
+    # Creation dates from the configured start up to today, update dates equal to or after creation
+    timestamps = created_range('customers').iter_created_updated(num_records)
+    
     # First, generate base customers
     for i in range(num_records):
-        # Creation date between configured range
-        created_at = fake.date_between_dates(
-            date_start=datetime.fromisoformat(DATE_RANGES['customers']['start']).date()
-        )
+        profiler.start_row()
         
-        # Update date (can be equal to or after creation)
-        updated_at = fake.date_between_dates(
-            date_start=created_at
-        )
+        created_at, updated_at = next(timestamps)
+        profiler.lap('created_at/updated_at', 'date_engine')
         
         # Generate email (some valid, others invalid)
         first_name = fake.first_name()
         last_name = fake.last_name()
+        profiler.lap('first_name/last_name', 'faker')
         
         # Use configured percentage for invalid emails
         if random.random() < PROBLEM_PERCENTAGES['customers']['invalid_email']:
@@ -189,6 +200,7 @@ def generate_customer_data(num_records=DEFAULT_NUM_CUSTOMERS):
         else:
             # Valid emails
             email = f"{first_name.lower()}.{last_name.lower()}@{fake.free_email_domain()}"
+        profiler.lap('email', 'faker')
         
         # Generate phone (some valid, others invalid)
         phone = None
@@ -199,6 +211,15 @@ def generate_customer_data(num_records=DEFAULT_NUM_CUSTOMERS):
                 phone = generate_invalid_phone(problem_type)
             else:
                 phone = generate_phone()
+        profiler.lap('phone', 'random')
+        
+        address = fake.street_address()
+        profiler.lap('address', 'faker')
+        
+        city = random.choice(BRAZILIAN_DATA['cities'])
+        state = random.choice(BRAZILIAN_DATA['states'])
+        zip_code = generate_zip_code()
+        profiler.lap('city/state/zip_code', 'random')
         
         customer = {
             'id': i + 1,
@@ -206,15 +227,16 @@ def generate_customer_data(num_records=DEFAULT_NUM_CUSTOMERS):
             'last_name': last_name,
             'email': email,
             'phone': phone,
-            'address': fake.street_address(),
-            'city': random.choice(BRAZILIAN_DATA['cities']),
-            'state': random.choice(BRAZILIAN_DATA['states']),
-            'zip_code': generate_zip_code(),
-            'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            'address': address,
+            'city': city,
+            'state': state,
+            'zip_code': zip_code,
+            'created_at': created_at,
+            'updated_at': updated_at
         }
+        profiler.lap('build row', 'python')
         
-        customers.append(customer)
+        yield customer
         base_customers.append(customer)
     
     # Now add intentional duplicates (about 3% of base customers will have duplicates)
@@ -228,15 +250,17 @@ def generate_customer_data(num_records=DEFAULT_NUM_CUSTOMERS):
             duplicate = create_duplicate_variations(base_customer, duplicate_type)
             
             if duplicate:
-                customers.append(duplicate)
+                yield duplicate
                 
                 # 30% chance to create a second duplicate (triplicate)
                 if random.random() < 0.30:
                     duplicate2 = create_duplicate_variations(base_customer, random.choice(duplicate_types))
                     if duplicate2:
-                        customers.append(duplicate2)
-    
-    return customers
+                        yield duplicate2
+
+def generate_customer_data(num_records=DEFAULT_NUM_CUSTOMERS):
+    """Generates customer data with intentional duplicates"""
+    return list(iter_customer_data(num_records))
 
 def save_to_csv(customers, filename=CUSTOMERS_FILE, num_records=None):
     """Saves data to CSV file"""
@@ -245,18 +269,16 @@ def save_to_csv(customers, filename=CUSTOMERS_FILE, num_records=None):
         print("No data to save!")
         return
     
-    # Get columns from first record
-    fieldnames = list(customers[0].keys())
-    
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=CUSTOMERS_FIELDNAMES)
         
         # Write header
         writer.writeheader()
         
         # Write data
-        for customer in customers:
-            writer.writerow(customer)
+        with profiler.stage('write (csv.DictWriter)', rows=len(customers)):
+            for customer in customers:
+                writer.writerow(customer)
     
     print(f"Data saved to {filename}")
     print(f"Total records: {len(customers)}")
@@ -283,16 +305,70 @@ def main():
         default=CUSTOMERS_FILE,
         help=f'Output filename (default: {CUSTOMERS_FILE})'
     )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Overlap generation, encoding and file writes in separate threads'
+    )
+    parser.add_argument(
+        '--format',
+        choices=FILE_FORMATS,
+        default='csv',
+        help='Output format in pipeline and partitioned mode (default: csv; parquet requires pyarrow)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Rows per chunk in pipeline mode (default: {DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f'Chunks buffered between pipeline stages (default: {DEFAULT_QUEUE_SIZE})'
+    )
+    add_partition_arguments(parser)
+    add_date_arguments(parser)
+    add_profile_arguments(parser)
+    add_cache_arguments(parser)
     
     args = parser.parse_args()
+    configure_dates_from_args(args)
+    configure_from_args(args)
+    seed_generators(args.seed)
+    
+    if args.pipeline:
+        if args.partitioned:
+            parser.error('--pipeline cannot be combined with --partitioned')
+        if args.cache:
+            parser.error('--pipeline cannot be combined with --cache')
+        
+        print(f"Generating {args.num_records} customer records in pipeline mode ({args.format})...")
+        chunks = (('raw_customers', chunk) for chunk in chunked(iter_customer_data(args.num_records), args.chunk_size))
+        pipeline = run_pipeline(chunks, {'raw_customers': (args.output, CUSTOMERS_FIELDNAMES, CUSTOMERS_TYPES)}, args.format, args.queue_size)
+        profiler.add_pipeline_stages(pipeline)
+        profiler.report()
+        return
     
     print(f"Generating {args.num_records} customer records...")
     
     # Generate data
-    customers = generate_customer_data(args.num_records)
+    with profiler.stage('generate', rows=args.num_records):
+        customers = generate_customer_data(args.num_records)
+    
+    if args.partitioned:
+        with profiler.stage('write partitions', rows=len(customers)):
+            save_partitioned(customers, 'raw_customers', CUSTOMERS_FIELDNAMES, args.partitions_dir, part_size=args.part_size,
+                             file_format=args.format, workers=args.workers)
+    else:
+        # Save to CSV
+        save_to_csv(customers, args.output, args.num_records)
     
-    # Save to CSV
-    save_to_csv(customers, args.output, args.num_records)
+    if args.cache:
+        with profiler.stage('write cache', rows=len(customers)):
+            save_cache(customers, 'raw_customers', CUSTOMERS_FIELDNAMES, args,
+                       {'num_records': args.num_records, 'intraday_times': args.intraday_times})
     
     # Show example of first records
     print("\nExample of first 3 records:")
@@ -300,6 +376,8 @@ def main():
         print(f"\nRecord {i+1}:")
         for key, value in customer.items():
             print(f"  {key}: {value}")
+    
+    profiler.report()
 
 if __name__ == "__main__":
     main()
@@ -5,20 +5,34 @@ Generates data that corresponds to the columns of the stg_items.sql and stg_orde
 """
 
 import csv
+import math
 import random
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from faker import Faker
 import argparse
 from config import (
     ITEMS_FILE, ORDERS_FILE, DEFAULT_NUM_ITEMS, DEFAULT_NUM_ORDERS,
     PROBLEM_PERCENTAGES, ORDER_PROBLEM_TYPES, VALUE_RANGES,
-    ORDER_STATUSES, PAYMENT_METHODS, DATE_RANGES
+    ORDER_STATUSES, PAYMENT_METHODS, DATE_RANGES, ORDER_VOLUME_PROFILE
 )
+from date_engine import created_range, date_range, add_date_arguments, configure_dates_from_args
+from partitions import partition_day, save_partitioned, add_partition_arguments
+from profiling import profiler, add_profile_arguments, configure_from_args
+from columnar_cache import add_cache_arguments, seed_generators, save_cache
+from pipeline import DEFAULT_CHUNK_SIZE, DEFAULT_QUEUE_SIZE, FILE_FORMATS, run_pipeline
 
 # Configure Faker for Brazilian Portuguese
 fake = Faker(['pt_BR'])
 
+# Output columns
+ITEMS_FIELDNAMES = ['item_id', 'order_id', 'product_id', 'quantity', 'unit_price', 'created_at']
+ORDERS_FIELDNAMES = ['id', 'customer_id', 'order_date', 'status', 'total_amount', 'payment_method', 'delivery_address', 'created_at']
+
+# Parquet types of the numeric columns (pipeline mode writes chunks, so they are declared, not inferred)
+ITEMS_TYPES = {'item_id': 'int64', 'order_id': 'int64', 'product_id': 'int64', 'quantity': 'int64', 'unit_price': 'float64'}
+ORDERS_TYPES = {'id': 'int64', 'customer_id': 'int64', 'total_amount': 'float64'}
+
 def generate_problematic_order(order_date, status, problem_type):
     """Generates problematic order data based on problem type from configuration"""
     if problem_type == 'negative_amount':
@@ -35,102 +49,247 @@ def generate_problematic_order(order_date, status, problem_type):
         return order_date, status, total_amount
     elif problem_type == 'future_date':
         # Future date (between 1 and 30 days in the future)
-        future_date = datetime.now().date() + timedelta(days=random.randint(*VALUE_RANGES['future_date_days']))
-        return future_date, status, 0
+        future_date = date.today() + timedelta(days=random.randint(*VALUE_RANGES['future_date_days']))
+        return future_date.isoformat(), status, 0
     else:
         return order_date, status, 0  # Default fallback
 
-def generate_items_data(num_records=DEFAULT_NUM_ITEMS, num_orders=DEFAULT_NUM_ORDERS):
-    """Generates items and orders data"""
+def build_order(order_id, created_at, problem_type=None):
+    """
+    Builds one order dict, optionally applying a data problem
+    created_at is a 'YYYY-MM-DD HH:MM:SS' string; its date is the order date
+    """
+    # Random status
+    status = random.choice(ORDER_STATUSES)
     
-    # Generate orders first
-    orders = []
-    for i in range(num_orders):
-        # Creation date between configured range
-        created_at = fake.date_between_dates(
-            date_start=datetime.fromisoformat(DATE_RANGES['orders']['start']).date()
-        )
-        
-        # Random status
-        status = random.choice(ORDER_STATUSES)
-        
-        # Random payment method
-        payment_method = random.choice(PAYMENT_METHODS)
-        
-        # Delivery address
-        delivery_address = fake.street_address()
-        
-        # Generate data problems to test problematic_orders
-        order_date = created_at
-        total_amount = 0  # Will be calculated based on items
-        
-        # Use configured percentage for orders with data problems
-        if i < int(num_orders * PROBLEM_PERCENTAGES['orders']['data_problems']):
-            # Randomly select problem type
-            problem_type = random.choice(ORDER_PROBLEM_TYPES)
-            order_date, status, total_amount = generate_problematic_order(order_date, status, problem_type)
-        
-        order = {
-            'id': i + 1,
-            'customer_id': random.randint(1, 1000),  # Assuming 1000 customers
-            'order_date': order_date.strftime('%Y-%m-%d') if order_date else None,
-            'status': status,
-            'total_amount': total_amount,  # Will be calculated based on items if not a problem
-            'payment_method': payment_method,
-            'delivery_address': delivery_address,
-            'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S')
-        }
-        orders.append(order)
+    # Random payment method
+    payment_method = random.choice(PAYMENT_METHODS)
+    profiler.lap('status/payment_method', 'random')
+    
+    # Delivery address
+    delivery_address = fake.street_address()
+    profiler.lap('delivery_address', 'faker')
     
-    # Generate items
+    # Generate data problems to test problematic_orders
+    order_date = created_at[:10]
+    total_amount = 0  # Will be calculated based on items
+    
+    if problem_type:
+        order_date, status, total_amount = generate_problematic_order(order_date, status, problem_type)
+    
+    customer_id = random.randint(1, 1000)  # Assuming 1000 customers
+    profiler.lap('problem/customer_id', 'random')
+    
+    return {
+        'id': order_id,
+        'customer_id': customer_id,
+        'order_date': order_date,
+        'status': status,
+        'total_amount': total_amount,  # Will be calculated based on items if not a problem
+        'payment_method': payment_method,
+        'delivery_address': delivery_address,
+        'created_at': created_at
+    }
+
+def build_order_items(order, first_item_id):
+    """Builds the items of an order, updating the order total when it has no problems"""
     items = []
-    item_id = 1
+    item_id = first_item_id
     
-    for order in orders:
-        # If order doesn't have value problem, calculate based on items
-        if order['total_amount'] == 0 and order['order_date'] is not None:
-            # Each order will have between 1 and 5 items
-            num_items_in_order = random.randint(1, 5)
+    # If order doesn't have value problem, calculate based on items
+    if order['total_amount'] == 0 and order['order_date'] is not None:
+        # Each order will have between 1 and 5 items
+        num_items_in_order = random.randint(1, 5)
+        
+        for _ in range(num_items_in_order):
+            # Generate item data
+            quantity = random.randint(1, 10)
+            unit_price = round(random.uniform(10.0, 500.0), 2)
+            
+            # Calculate item total
+            total_price = quantity * unit_price
+            
+            # Add to order total
+            order['total_amount'] += total_price
             
-            for _ in range(num_items_in_order):
-                # Generate item data
-                quantity = random.randint(1, 10)
-                unit_price = round(random.uniform(10.0, 500.0), 2)
-                
-                # Calculate item total
-                total_price = quantity * unit_price
-                
-                # Add to order total
-                order['total_amount'] += total_price
-                
-                item = {
-                    'item_id': item_id,
-                    'order_id': order['id'],
-                    'product_id': random.randint(1, 1000),  # Fictitious product IDs
-                    'quantity': quantity,
-                    'unit_price': unit_price,
-                    'created_at': order['created_at']
-                }
-                
-                items.append(item)
-                item_id += 1
-        else:
-            # For problematic orders, create at least one item to maintain referential integrity
-            # but don't calculate total (already defined by problem)
             item = {
                 'item_id': item_id,
                 'order_id': order['id'],
-                'product_id': random.randint(1, 1000),
-                'quantity': random.randint(1, 5),
-                'unit_price': round(random.uniform(10.0, 100.0), 2),
+                'product_id': random.randint(1, 1000),  # Fictitious product IDs
+                'quantity': quantity,
+                'unit_price': unit_price,
                 'created_at': order['created_at']
             }
             
             items.append(item)
             item_id += 1
+    else:
+        # For problematic orders, create at least one item to maintain referential integrity
+        # but don't calculate total (already defined by problem)
+        item = {
+            'item_id': item_id,
+            'order_id': order['id'],
+            'product_id': random.randint(1, 1000),
+            'quantity': random.randint(1, 5),
+            'unit_price': round(random.uniform(10.0, 100.0), 2),
+            'created_at': order['created_at']
+        }
+        
+        items.append(item)
+    
+    profiler.lap('items', 'random')
+    return items
+
+def iter_items_data(num_orders=DEFAULT_NUM_ORDERS):
+    """Yields (order, items) pairs one order at a time"""
     
+    num_items = 0
+    
+    # Creation dates from the configured start up to today
+    timestamps = created_range('orders').iter_created(num_orders)
+    
+    for i in range(num_orders):
+        profiler.start_row()
+        
+        created_at = next(timestamps)
+        profiler.lap('created_at', 'date_engine')
+        
+        # Use configured percentage for orders with data problems
+        problem_type = None
+        if i < int(num_orders * PROBLEM_PERCENTAGES['orders']['data_problems']):
+            # Randomly select problem type
+            problem_type = random.choice(ORDER_PROBLEM_TYPES)
+        
+        order = build_order(i + 1, created_at, problem_type)
+        order_items = build_order_items(order, num_items + 1)
+        num_items += len(order_items)
+        yield order, order_items
+
+def collect_items_data(pairs):
+    """Collects (order, items) pairs into the items and orders lists"""
+    orders = []
+    items = []
+    for order, order_items in pairs:
+        orders.append(order)
+        items.extend(order_items)
     return items, orders
 
+def generate_items_data(num_records=DEFAULT_NUM_ITEMS, num_orders=DEFAULT_NUM_ORDERS):
+    """Generates items and orders data"""
+    return collect_items_data(iter_items_data(num_orders))
+
+def black_friday(year):
+    """Returns the date of Black Friday (the day after the fourth Thursday of November)"""
+    november_first = date(year, 11, 1)
+    first_thursday = november_first + timedelta(days=(3 - november_first.weekday()) % 7)
+    return first_thursday + timedelta(weeks=3, days=1)
+
+def day_volume_weight(day, start_date, profile=ORDER_VOLUME_PROFILE):
+    """Relative order volume of a day according to the volume profile"""
+    weight = profile['weekday_weights'][day.weekday()]
+    
+    # Annual seasonality
+    day_of_year = day.timetuple().tm_yday
+    weight *= 1 + profile['annual_amplitude'] * math.cos(
+        2 * math.pi * (day_of_year - profile['annual_peak_day']) / 365.25
+    )
+    
+    # Growth since the start of the range
+    weight *= (1 + profile['yearly_growth']) ** ((day - start_date).days / 365.25)
+    
+    # Fixed-date spikes
+    weight *= profile['spikes'].get(day.strftime('%m-%d'), 1.0)
+    
+    # Black Friday, the weekend after it and Cyber Monday
+    days_after_black_friday = (day - black_friday(day.year)).days
+    if days_after_black_friday == 0:
+        weight *= profile['black_friday_multiplier']
+    elif days_after_black_friday in (1, 2):
+        weight *= profile['black_friday_weekend_multiplier']
+    elif days_after_black_friday == 3:
+        weight *= profile['cyber_monday_multiplier']
+    
+    # Day-to-day variation
+    if profile['noise']:
+        weight *= max(0.0, random.gauss(1.0, profile['noise']))
+    
+    return weight
+
+def daily_order_volumes(num_orders=DEFAULT_NUM_ORDERS, daily_orders=None,
+                        start=DATE_RANGES['orders']['start'], end=DATE_RANGES['orders']['end']):
+    """
+    Returns a list of (day, number of orders) following ORDER_VOLUME_PROFILE
+    
+    If daily_orders is given it is used as the volume of an average day,
+    otherwise num_orders is distributed over the whole date range.
+    """
+    start_date = datetime.fromisoformat(start).date()
+    end_date = datetime.fromisoformat(end).date()
+    days = [start_date + timedelta(days=n) for n in range((end_date - start_date).days + 1)]
+    weights = [day_volume_weight(day, start_date) for day in days]
+    
+    if daily_orders is not None:
+        mean_weight = sum(weights) / len(weights)
+        return [(day, round(daily_orders * weight / mean_weight)) for day, weight in zip(days, weights)]
+    
+    # Distribute exactly num_orders using the largest remainder method
+    total_weight = sum(weights)
+    targets = [num_orders * weight / total_weight for weight in weights]
+    volumes = [int(target) for target in targets]
+    remaining = num_orders - sum(volumes)
+    by_remainder = sorted(range(len(days)), key=lambda n: targets[n] - volumes[n], reverse=True)
+    for n in by_remainder[:remaining]:
+        volumes[n] += 1
+    
+    return list(zip(days, volumes))
+
+def iter_timeseries_data(num_orders=DEFAULT_NUM_ORDERS, daily_orders=None):
+    """Yields (order, items) pairs day by day, sorted by order date"""
+    
+    num_orders_generated = 0
+    num_items = 0
+    problem_percentage = PROBLEM_PERCENTAGES['orders']['data_problems']
+    orders_range = date_range('orders')
+    
+    for day, volume in daily_order_volumes(num_orders, daily_orders):
+        for timestamp in orders_range.day_timestamps(orders_range.day_offset(day), volume):
+            profiler.start_row()
+            created_at = orders_range.format(timestamp)
+            profiler.lap('created_at', 'date_engine')
+            
+            # Problems are spread over the whole range instead of the first orders
+            problem_type = None
+            if random.random() < problem_percentage:
+                problem_type = random.choice(ORDER_PROBLEM_TYPES)
+            
+            num_orders_generated += 1
+            order = build_order(num_orders_generated, created_at, problem_type)
+            order_items = build_order_items(order, num_items + 1)
+            num_items += len(order_items)
+            yield order, order_items
+
+def generate_timeseries_data(num_orders=DEFAULT_NUM_ORDERS, daily_orders=None):
+    """Generates items and orders day by day, sorted by order date"""
+    return collect_items_data(iter_timeseries_data(num_orders, daily_orders))
+
+def iter_output_chunks(pairs, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Groups (order, items) pairs into ('raw_orders', rows) and ('raw_items', rows) chunks"""
+    orders = []
+    items = []
+    for order, order_items in pairs:
+        orders.append(order)
+        items.extend(order_items)
+        if len(orders) >= chunk_size:
+            yield 'raw_orders', orders
+            orders = []
+        if len(items) >= chunk_size:
+            yield 'raw_items', items
+            items = []
+    if orders:
+        yield 'raw_orders', orders
+    if items:
+        yield 'raw_items', items
+
 def save_to_csv(data, filename, fieldnames):
     """Saves data to CSV file"""
     
@@ -149,8 +308,9 @@ def save_to_csv(data, filename, fieldnames):
             writer.writeheader()
             
             # Write data
-            for row in data:
-                writer.writerow(row)
+            with profiler.stage('write (csv.DictWriter)', rows=len(data)):
+                for row in data:
+                    writer.writerow(row)
         
         print(f"Data saved to {filename}")
         print(f"Total records: {len(data)}")
@@ -175,22 +335,117 @@ def main():
         default=DEFAULT_NUM_ORDERS,
         help=f'Number of orders to generate (default: {DEFAULT_NUM_ORDERS})'
     )
-
+    parser.add_argument(
+        '--time-series',
+        action='store_true',
+        help='Generate orders day by day following ORDER_VOLUME_PROFILE, sorted by order date'
+    )
+    parser.add_argument(
+        '--daily-orders',
+        type=int,
+        default=None,
+        help='Orders on an average day in time-series mode (overrides --num-orders)'
+    )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Overlap generation, encoding and file writes in separate threads'
+    )
+    parser.add_argument(
+        '--format',
+        choices=FILE_FORMATS,
+        default='csv',
+        help='Output format in pipeline and partitioned mode (default: csv; parquet requires pyarrow)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Rows per chunk in pipeline mode (default: {DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f'Chunks buffered between pipeline stages (default: {DEFAULT_QUEUE_SIZE})'
+    )
+    add_partition_arguments(parser, by_day=True)
+    add_date_arguments(parser)
+    add_profile_arguments(parser)
+    add_cache_arguments(parser)
     
     args = parser.parse_args()
+    configure_dates_from_args(args)
+    configure_from_args(args)
+    seed_generators(args.seed)
+    time_series = args.time_series or args.daily_orders is not None
+    partitioned = args.partitioned or args.partition_by_day
     
-    print(f"Generating {args.num_orders} orders with {args.num_items} items...")
+    if args.pipeline:
+        if partitioned:
+            parser.error('--pipeline cannot be combined with --partitioned or --partition-by-day')
+        if args.cache:
+            parser.error('--pipeline cannot be combined with --cache')
+        
+        print(f"Generating orders and items in pipeline mode ({args.format})...")
+        if time_series:
+            pairs = iter_timeseries_data(args.num_orders, args.daily_orders)
+        else:
+            pairs = iter_items_data(args.num_orders)
+        
+        outputs = {
+            'raw_orders': (ORDERS_FILE, ORDERS_FIELDNAMES, ORDERS_TYPES),
+            'raw_items': (ITEMS_FILE, ITEMS_FIELDNAMES, ITEMS_TYPES)
+        }
+        pipeline = run_pipeline(iter_output_chunks(pairs, args.chunk_size), outputs, args.format, args.queue_size)
+        profiler.add_pipeline_stages(pipeline)
+        profiler.report()
+        return
     
     # Generate data
-    items, orders = generate_items_data(args.num_items, args.num_orders)
+    if time_series:
+        print("Generating orders and items in time-series mode...")
+        with profiler.stage('generate') as timer:
+            items, orders = generate_timeseries_data(args.num_orders, args.daily_orders)
+            timer.rows = len(orders) + len(items)
+        print(f"Generated {len(orders)} orders with {len(items)} items")
+        
+        volumes = {}
+        for order in orders:
+            day = partition_day(order)
+            volumes[day] = volumes.get(day, 0) + 1
+        peak_day = max(volumes, key=volumes.get)
+        print(f"Days: {len(volumes)}, average orders per day: {len(orders) / len(volumes):.1f}")
+        print(f"Peak day: {peak_day} with {volumes[peak_day]} orders")
+    else:
+        print(f"Generating {args.num_orders} orders with {args.num_items} items...")
+        with profiler.stage('generate') as timer:
+            items, orders = generate_items_data(args.num_items, args.num_orders)
+            timer.rows = len(orders) + len(items)
     
-    # Save items
-    items_fieldnames = ['item_id', 'order_id', 'product_id', 'quantity', 'unit_price', 'created_at']
-    save_to_csv(items, ITEMS_FILE, items_fieldnames)
+    if partitioned:
+        with profiler.stage('write partitions', rows=len(items) + len(orders)):
+            for data, entity, fieldnames in [(items, 'raw_items', ITEMS_FIELDNAMES), (orders, 'raw_orders', ORDERS_FIELDNAMES)]:
+                save_partitioned(
+                    data, entity, fieldnames, args.partitions_dir, args.partition_by_day,
+                    args.part_size, args.format, args.workers
+                )
+    else:
+        # Save items
+        save_to_csv(items, ITEMS_FILE, ITEMS_FIELDNAMES)
+        
+        # Save orders
+        save_to_csv(orders, ORDERS_FILE, ORDERS_FIELDNAMES)
     
-    # Save orders
-    orders_fieldnames = ['id', 'customer_id', 'order_date', 'status', 'total_amount', 'payment_method', 'delivery_address', 'created_at']
-    save_to_csv(orders, ORDERS_FILE, orders_fieldnames)
+    if args.cache:
+        # Both entities come from one generation run, so they share its parameters
+        params = {
+            'num_items': args.num_items, 'num_orders': args.num_orders, 'time_series': time_series,
+            'daily_orders': args.daily_orders, 'intraday_times': args.intraday_times
+        }
+        with profiler.stage('write cache', rows=len(items) + len(orders)):
+            save_cache(items, 'raw_items', ITEMS_FIELDNAMES, args, params)
+            save_cache(orders, 'raw_orders', ORDERS_FIELDNAMES, args, params)
     
     # Show example of first records
     print("\n=== Example of first 3 items ===")
@@ -204,6 +459,8 @@ def main():
         print(f"\nOrder {i+1}:")
         for key, value in order.items():
             print(f"  {key}: {value}")
+    
+    profiler.report()
 
 if __name__ == "__main__":
     main()
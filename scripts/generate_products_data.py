@@ -7,18 +7,31 @@ Generates data that corresponds to the columns of the stg_products.sql model
 import csv
 import random
 import os
-from datetime import datetime
 from faker import Faker
 import argparse
 from config import (
     PRODUCTS_FILE, DEFAULT_NUM_PRODUCTS, PROBLEM_PERCENTAGES,
-    DATE_RANGES, PRODUCT_CATEGORIES, PRODUCTS_BY_CATEGORY,
+    PRODUCT_CATEGORIES, PRODUCTS_BY_CATEGORY,
     PRODUCT_PROBLEM_TYPES, VALUE_RANGES
 )
+from date_engine import created_range, add_date_arguments, configure_dates_from_args
+from partitions import save_partitioned, add_partition_arguments
+from profiling import profiler, add_profile_arguments, configure_from_args
+from columnar_cache import add_cache_arguments, seed_generators, save_cache
+from pipeline import DEFAULT_CHUNK_SIZE, DEFAULT_QUEUE_SIZE, FILE_FORMATS, chunked, run_pipeline
 
 # Configure Faker for Brazilian Portuguese
 fake = Faker(['pt_BR'])
 
+# Output columns
+PRODUCTS_FIELDNAMES = [
+    'id', 'name', 'category', 'price', 'description', 'brand',
+    'created_at', 'updated_at'
+]
+
+# Parquet types of the numeric columns (pipeline mode writes chunks, so they are declared, not inferred)
+PRODUCTS_TYPES = {'id': 'int64', 'price': 'float64'}
+
 def generate_problematic_price(problem_type):
     """Generates problematic price based on problem type from configuration"""
     if problem_type == 'negative_price':
@@ -32,12 +45,15 @@ def generate_problematic_price(problem_type):
     else:
         return round(random.uniform(10.0, 1000.0), 2)  # Default fallback
 
-def generate_product_data(num_records=DEFAULT_NUM_PRODUCTS):
-    """Generates product data"""
+def iter_product_data(num_records=DEFAULT_NUM_PRODUCTS):
+    """Yields product rows one by one"""
     
-    products = []
+    # Creation dates from the configured start up to today, update dates equal to or after creation
+    timestamps = created_range('products').iter_created_updated(num_records)
     
     for i in range(num_records):
+        profiler.start_row()
+        
         # Select category randomly
         category = random.choice(PRODUCT_CATEGORIES)
         
@@ -46,6 +62,7 @@ def generate_product_data(num_records=DEFAULT_NUM_PRODUCTS):
             product_name = random.choice(PRODUCTS_BY_CATEGORY[category])
         else:
             product_name = f"Generic {category} Product {i+1}"
+        profiler.lap('category/name', 'random')
         
         # Generate price (some products will have price problems)
         if random.random() < PROBLEM_PERCENTAGES['products']['price_problems']:
@@ -54,31 +71,34 @@ def generate_product_data(num_records=DEFAULT_NUM_PRODUCTS):
         else:
             # Normal prices
             price = round(random.uniform(10.0, 1000.0), 2)
+        profiler.lap('price', 'random')
+        
+        created_at, updated_at = next(timestamps)
+        profiler.lap('created_at/updated_at', 'date_engine')
         
-        # Creation date
-        created_at = fake.date_between_dates(
-            date_start=datetime.fromisoformat(DATE_RANGES['products']['start']).date()
-        )
+        description = fake.text(max_nb_chars=200)
+        profiler.lap('description', 'faker')
         
-        # Update date
-        updated_at = fake.date_between_dates(
-            date_start=created_at
-        )
+        brand = fake.company()
+        profiler.lap('brand', 'faker')
         
         product = {
             'id': i + 1,
             'name': product_name,
             'category': category,
             'price': price,
-            'description': fake.text(max_nb_chars=200),
-            'brand': fake.company(),
-            'created_at': created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'updated_at': updated_at.strftime('%Y-%m-%d %H:%M:%S')
+            'description': description,
+            'brand': brand,
+            'created_at': created_at,
+            'updated_at': updated_at
         }
+        profiler.lap('build row', 'python')
         
-        products.append(product)
-    
-    return products
+        yield product
+
+def generate_product_data(num_records=DEFAULT_NUM_PRODUCTS):
+    """Generates product data"""
+    return list(iter_product_data(num_records))
 
 def save_to_csv(products, filename=PRODUCTS_FILE):
     """Saves data to CSV file"""
@@ -87,21 +107,19 @@ def save_to_csv(products, filename=PRODUCTS_FILE):
         print("No data to save!")
         return
     
-    # Get columns from first record
-    fieldnames = list(products[0].keys())
-    
     # Create directory if it doesn't exist
     os.makedirs(os.path.dirname(filename), exist_ok=True)
     
     with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=PRODUCTS_FIELDNAMES)
         
         # Write header
         writer.writeheader()
         
         # Write data
-        for product in products:
-            writer.writerow(product)
+        with profiler.stage('write (csv.DictWriter)', rows=len(products)):
+            for product in products:
+                writer.writerow(product)
     
     print(f"Data saved to {filename}")
     print(f"Total records: {len(products)}")
@@ -122,16 +140,70 @@ def main():
         default=PRODUCTS_FILE,
         help=f'Output filename (default: {PRODUCTS_FILE})'
     )
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        help='Overlap generation, encoding and file writes in separate threads'
+    )
+    parser.add_argument(
+        '--format',
+        choices=FILE_FORMATS,
+        default='csv',
+        help='Output format in pipeline and partitioned mode (default: csv; parquet requires pyarrow)'
+    )
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f'Rows per chunk in pipeline mode (default: {DEFAULT_CHUNK_SIZE})'
+    )
+    parser.add_argument(
+        '--queue-size',
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f'Chunks buffered between pipeline stages (default: {DEFAULT_QUEUE_SIZE})'
+    )
+    add_partition_arguments(parser)
+    add_date_arguments(parser)
+    add_profile_arguments(parser)
+    add_cache_arguments(parser)
     
     args = parser.parse_args()
+    configure_dates_from_args(args)
+    configure_from_args(args)
+    seed_generators(args.seed)
+    
+    if args.pipeline:
+        if args.partitioned:
+            parser.error('--pipeline cannot be combined with --partitioned')
+        if args.cache:
+            parser.error('--pipeline cannot be combined with --cache')
+        
+        print(f"Generating {args.num_products} products in pipeline mode ({args.format})...")
+        chunks = (('raw_products', chunk) for chunk in chunked(iter_product_data(args.num_products), args.chunk_size))
+        pipeline = run_pipeline(chunks, {'raw_products': (args.output, PRODUCTS_FIELDNAMES, PRODUCTS_TYPES)}, args.format, args.queue_size)
+        profiler.add_pipeline_stages(pipeline)
+        profiler.report()
+        return
     
     print(f"Generating {args.num_products} products...")
     
     # Generate data
-    products = generate_product_data(args.num_products)
+    with profiler.stage('generate', rows=args.num_products):
+        products = generate_product_data(args.num_products)
     
-    # Save to CSV
-    save_to_csv(products, args.output)
+    if args.partitioned:
+        with profiler.stage('write partitions', rows=len(products)):
+            save_partitioned(products, 'raw_products', PRODUCTS_FIELDNAMES, args.partitions_dir, part_size=args.part_size,
+                             file_format=args.format, workers=args.workers)
+    else:
+        # Save to CSV
+        save_to_csv(products, args.output)
+    
+    if args.cache:
+        with profiler.stage('write cache', rows=len(products)):
+            save_cache(products, 'raw_products', PRODUCTS_FIELDNAMES, args,
+                       {'num_products': args.num_products, 'intraday_times': args.intraday_times})
     
     # Show example of first records
     print("\n=== Example of first 5 products ===")
@@ -150,6 +222,8 @@ def main():
     print("Products by category:")
     for category, count in sorted(category_counts.items()):
         print(f"  {category}: {count} products")
+    
+    profiler.report()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Script to load partitioned part files into the warehouse
+Part files are parsed concurrently by a pool of processes and inserted into the
+SQLite database of the dbt profile (one writer), in loaded_raw_* tables that the
+staging models read with --vars '{use_loaded_tables: true}' (source 'loaded').
+With --duckdb the partitions are exposed as glob views instead of being copied, and
+with --from-cache the tables are loaded from the columnar cache (no text parsing).
+"""
+
+import csv
+import os
+import sqlite3
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from config import PARTITIONS_DIR, SEEDS_DIR, DATABASE_FILE, CACHE_DIR
+from partitions import DEFAULT_WORKERS, find_parts
+from columnar_cache import open_cache
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Entities produced by the generators in partitioned mode
+ENTITIES = ['raw_customers', 'raw_products', 'raw_orders', 'raw_items']
+
+# Prefix of the loaded tables, so that dbt seed never replaces them
+# (declared as the 'loaded' source in models/staging/sources.yml)
+TABLE_PREFIX = 'loaded_'
+
+# Column types in the order they are widened (same types dbt seed creates on SQLite)
+COLUMN_TYPES = ['INT', 'REAL', 'TEXT']
+
+# SQLite types of the columnar cache kinds
+CACHE_COLUMN_TYPES = {'int64': 'INT', 'bool': 'INT', 'float64': 'REAL', 'string': 'TEXT'}
+
+def value_type(value):
+    """Narrowest column type that can hold a CSV value"""
+    try:
+        int(value)
+        return 'INT'
+    except ValueError:
+        pass
+    try:
+        float(value)
+        return 'REAL'
+    except ValueError:
+        return 'TEXT'
+
+def parse_csv(filename):
+    """Reads a CSV part file; returns (columns, types, rows) with empty values as NULL"""
+    with open(filename, newline='', encoding='utf-8') as csvfile:
+        reader = csv.reader(csvfile)
+        columns = next(reader)
+        rows = [tuple(value if value != '' else None for value in row) for row in reader]
+
+    types = []
+    for n in range(len(columns)):
+        column_type = 0
+        for row in rows:
+            if row[n] is not None:
+                column_type = max(column_type, COLUMN_TYPES.index(value_type(row[n])))
+                if column_type == len(COLUMN_TYPES) - 1:
+                    break
+        types.append(COLUMN_TYPES[column_type])
+    return columns, types, rows
+
+def parse_parquet(filename):
+    """Reads a Parquet part file; returns (columns, types, rows) with empty values as NULL"""
+    if pq is None:
+        raise ImportError("Parquet input requires pyarrow (pip install pyarrow)")
+    table = pq.read_table(filename)
+    types = []
+    for field in table.schema:
+        if str(field.type).startswith(('int', 'uint')):
+            types.append('INT')
+        elif str(field.type) in ('float', 'double'):
+            types.append('REAL')
+        else:
+            types.append('TEXT')
+    columns = table.column_names
+    data = table.to_pydict()
+    rows = [
+        tuple(value if value != '' else None for value in row)
+        for row in zip(*(data[column] for column in columns))
+    ]
+    return columns, types, rows
+
+def parse_part(filename):
+    """Parses one part file (runs in a worker process)"""
+    if filename.endswith('.parquet'):
+        return parse_parquet(filename)
+    return parse_csv(filename)
+
+def iter_parsed(filenames, workers=DEFAULT_WORKERS):
+    """
+    Yields (filename, (columns, types, rows)) in file order while the next files
+    are parsed in the pool; at most 2 * workers files are in memory at once
+    """
+    if workers <= 1:
+        for filename in filenames:
+            yield filename, parse_part(filename)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = []
+        for filename in filenames:
+            pending.append((filename, executor.submit(parse_part, filename)))
+            if len(pending) >= 2 * workers:
+                filename, future = pending.pop(0)
+                yield filename, future.result()
+        for filename, future in pending:
+            yield filename, future.result()
+
+def create_table(connection, table, columns, types):
+    """Drops and recreates a table; returns its INSERT statement"""
+    definition = ', '.join(f'"{column}" {column_type}' for column, column_type in zip(columns, types))
+    connection.execute(f'DROP TABLE IF EXISTS "{table}"')
+    connection.execute(f'CREATE TABLE "{table}" ({definition})')
+    return f'INSERT INTO "{table}" VALUES ({", ".join("?" for _ in columns)})'
+
+def load_entity(connection, table, filenames, workers=DEFAULT_WORKERS):
+    """Replaces a table with the rows of part files; returns (columns, row count)"""
+    num_rows = 0
+    columns = None
+
+    for filename, (file_columns, types, rows) in iter_parsed(filenames, workers):
+        if columns is None:
+            # The table is created from the first file (types are affinities on SQLite,
+            # so later values of another type are still stored)
+            columns = file_columns
+            insert = create_table(connection, table, columns, types)
+        elif file_columns != columns:
+            raise ValueError(f"{filename} has columns {file_columns}, expected {columns}")
+
+        connection.executemany(insert, rows)
+        num_rows += len(rows)
+
+    connection.commit()
+    return columns, num_rows
+
+def load_cached_entity(connection, table, cache):
+    """Replaces a table with the rows of a columnar cache; returns (columns, row count)"""
+    types = [CACHE_COLUMN_TYPES[cache.kinds[column]] for column in cache.columns]
+    insert = create_table(connection, table, cache.columns, types)
+    for rows in cache.iter_batches():
+        connection.executemany(insert, rows)
+    connection.commit()
+    return cache.columns, cache.num_rows
+
+def count_differences(connection, table, filenames, workers=DEFAULT_WORKERS):
+    """
+    Loads the files into a scratch table and returns the number of rows that are
+    only in the table or only in the files (0 when both loads are identical)
+    """
+    scratch = f"{table}__verify"
+    load_entity(connection, scratch, filenames, workers)
+    try:
+        return sum(
+            connection.execute(
+                f'SELECT COUNT(*) FROM (SELECT * FROM "{left}" EXCEPT SELECT * FROM "{right}")'
+            ).fetchone()[0]
+            for left, right in ((table, scratch), (scratch, table))
+        ) + abs(
+            connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            - connection.execute(f'SELECT COUNT(*) FROM "{scratch}"').fetchone()[0]
+        )
+    finally:
+        connection.execute(f'DROP TABLE "{scratch}"')
+        connection.commit()
+
+def connect_for_bulk_load(database):
+    """Opens the SQLite database with the settings of a bulk load"""
+    os.makedirs(os.path.dirname(database), exist_ok=True)
+    connection = sqlite3.connect(database)
+    # Bulk load: the tables are rebuilt from the files if the load is interrupted
+    connection.execute('PRAGMA journal_mode = OFF')
+    connection.execute('PRAGMA synchronous = OFF')
+    return connection
+
+def load_sqlite(entities, partitions_dir=PARTITIONS_DIR, database=DATABASE_FILE, workers=DEFAULT_WORKERS):
+    """Loads the part files of each entity into the loaded_<entity> table of the SQLite database"""
+    connection = connect_for_bulk_load(database)
+
+    summary = []
+    try:
+        for entity in entities:
+            filenames = find_parts(partitions_dir, entity)
+            if not filenames:
+                print(f"⚠️  No part files for {entity} in {partitions_dir}")
+                continue
+
+            start = time.perf_counter()
+            _, num_rows = load_entity(connection, TABLE_PREFIX + entity, filenames, workers)
+            seconds = time.perf_counter() - start
+            summary.append((entity, len(filenames), num_rows, seconds))
+            print(f"{TABLE_PREFIX}{entity}: {num_rows} rows from {len(filenames)} files in {seconds:.2f}s")
+    finally:
+        connection.close()
+
+    return summary
+
+def load_sqlite_from_cache(entities, cache_dir=CACHE_DIR, database=DATABASE_FILE, seeds_dir=SEEDS_DIR,
+                           verify=False, partitions_dir=PARTITIONS_DIR, workers=DEFAULT_WORKERS):
+    """
+    Loads the latest columnar cache of each entity into the loaded_<entity> table of the
+    SQLite database; with verify, also compares each table with a load of the part
+    files (or of the seed file)
+    """
+    connection = connect_for_bulk_load(database)
+
+    summary = []
+    mismatches = 0
+    try:
+        for entity in entities:
+            try:
+                cache = open_cache(entity, cache_dir=cache_dir)
+            except FileNotFoundError as e:
+                print(f"⚠️  {e}")
+                continue
+
+            start = time.perf_counter()
+            table = TABLE_PREFIX + entity
+            _, num_rows = load_cached_entity(connection, table, cache)
+            seconds = time.perf_counter() - start
+            summary.append((entity, 1, num_rows, seconds))
+            print(f"{table}: {num_rows} rows from {cache.path} in {seconds:.2f}s")
+
+            if verify:
+                seed_file = os.path.join(seeds_dir, f"{entity}.csv")
+                filenames = find_parts(partitions_dir, entity) or [seed_file]
+                if not os.path.exists(filenames[0]):
+                    print(f"⚠️  No part files or seed file to verify {entity} against")
+                    continue
+                differences = count_differences(connection, table, filenames, workers)
+                mismatches += differences
+                if differences:
+                    print(f"❌ {table}: {differences} rows differ from {len(filenames)} CSV/Parquet files")
+                else:
+                    print(f"✅ {table}: identical to {len(filenames)} CSV/Parquet files")
+    finally:
+        connection.close()
+
+    if mismatches:
+        raise ValueError(f"The cache load differs from the file load in {mismatches} rows")
+    return summary
+
+def create_duckdb_views(entities, partitions_dir=PARTITIONS_DIR, database=None):
+    """Creates one loaded_<entity> view per entity over a glob of its part files (no copy)"""
+    if duckdb is None:
+        raise ImportError("--duckdb requires duckdb (pip install duckdb)")
+
+    connection = duckdb.connect(database)
+    try:
+        for entity in entities:
+            filenames = find_parts(partitions_dir, entity)
+            if not filenames:
+                print(f"⚠️  No part files for {entity} in {partitions_dir}")
+                continue
+
+            # order_date is already a column of the files, so the directory key is not added
+            pattern = os.path.join(os.path.abspath(partitions_dir), entity, '**', f"part-*{os.path.splitext(filenames[0])[1]}")
+            if filenames[0].endswith('.parquet'):
+                source = f"read_parquet('{pattern}', union_by_name = true)"
+            else:
+                source = f"read_csv_auto('{pattern}', header = true, union_by_name = true)"
+            table = TABLE_PREFIX + entity
+            connection.execute(f'CREATE OR REPLACE VIEW "{table}" AS SELECT * FROM {source}')
+            num_rows = connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+            print(f"{table}: view over {len(filenames)} files ({num_rows} rows)")
+    finally:
+        connection.close()
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load partitioned part files into the dbt database'
+    )
+    parser.add_argument(
+        '-e', '--entities',
+        nargs='+',
+        choices=ENTITIES,
+        default=ENTITIES,
+        help='Entities to load (default: all)'
+    )
+    parser.add_argument(
+        '--partitions-dir',
+        type=str,
+        default=PARTITIONS_DIR,
+        help=f'Base directory of the part files (default: {PARTITIONS_DIR})'
+    )
+    parser.add_argument(
+        '--database',
+        type=str,
+        default=DATABASE_FILE,
+        help=f'SQLite database (default: {DATABASE_FILE})'
+    )
+    parser.add_argument(
+        '--seeds-dir',
+        type=str,
+        default=SEEDS_DIR,
+        help=f'Seeds directory, where --verify finds the seed files of unpartitioned entities (default: {SEEDS_DIR})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Processes parsing part files (default: {DEFAULT_WORKERS})'
+    )
+    parser.add_argument(
+        '--duckdb',
+        type=str,
+        default=None,
+        metavar='DATABASE',
+        help='Create glob views in this DuckDB database instead of loading SQLite'
+    )
+    parser.add_argument(
+        '--from-cache',
+        action='store_true',
+        help='Load the latest columnar cache of each entity instead of the part files (generators run with --cache)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=CACHE_DIR,
+        help=f'Base directory of the columnar cache (default: {CACHE_DIR})'
+    )
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='With --from-cache, check that every table equals a load of the part files (or seed files)'
+    )
+
+    args = parser.parse_args()
+
+    print(f"\n{'='*50}")
+    print("📥 LOADING PARTITIONS")
+    print(f"{'='*50}")
+
+    if args.duckdb:
+        create_duckdb_views(args.entities, args.partitions_dir, args.duckdb)
+        return
+
+    if args.verify and not args.from_cache:
+        parser.error('--verify requires --from-cache')
+
+    start = time.perf_counter()
+    if args.from_cache:
+        try:
+            summary = load_sqlite_from_cache(args.entities, args.cache_dir, args.database, args.seeds_dir,
+                                             args.verify, args.partitions_dir, args.workers)
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    else:
+        summary = load_sqlite(args.entities, args.partitions_dir, args.database, args.workers)
+    if not summary:
+        sys.exit(1)
+
+    total_rows = sum(num_rows for _, _, num_rows, _ in summary)
+    seconds = time.perf_counter() - start
+    source = 'columnar cache' if args.from_cache else f"{args.workers} workers"
+    print(f"\nLoaded {total_rows} rows into {args.database} in {seconds:.2f}s ({total_rows / seconds:.0f} rows/s, {source})")
+    print("Build from the loaded tables: dbt build --vars '{use_loaded_tables: true}'")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Partitioned multi-file output for the generator scripts
+Writes each entity as several part files (fixed-size parts, optionally split by
+order day) so that writes and loads are not limited to a single file
+"""
+
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from config import PARTITIONS_DIR, DEFAULT_PART_SIZE
+from pipeline import ENCODERS, SINKS, ParquetEncoder
+
+# Part files written (or parsed) at the same time
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+def partition_day(row):
+    """Partition key of a row: the day its order was generated"""
+    return row['created_at'][:10]
+
+def part_filename(base_dir, entity, part, file_format='csv', day=None):
+    """
+    <base_dir>/<entity>/part-NNNN.<format>, or
+    <base_dir>/<entity>/order_date=YYYY-MM-DD/part-NNNN.<format> for daily partitions
+    """
+    entity_dir = os.path.join(base_dir, entity)
+    if day is not None:
+        entity_dir = os.path.join(entity_dir, f"order_date={day}")
+    return os.path.join(entity_dir, f"part-{part:04d}.{file_format}")
+
+def find_parts(base_dir, entity):
+    """Sorted list of the part files of an entity (any format, any partition)"""
+    pattern = os.path.join(base_dir, entity, '**', 'part-*.*')
+    return sorted(
+        filename for filename in glob.glob(pattern, recursive=True)
+        if os.path.splitext(filename)[1] in ('.csv', '.parquet')
+    )
+
+def clear_parts(base_dir, entity):
+    """Removes the part files of a previous run (and the partition directories left empty)"""
+    for filename in find_parts(base_dir, entity):
+        os.remove(filename)
+        partition_dir = os.path.dirname(filename)
+        if os.path.basename(partition_dir).startswith('order_date=') and not os.listdir(partition_dir):
+            os.rmdir(partition_dir)
+
+def split_parts(rows, part_size=DEFAULT_PART_SIZE):
+    """Splits a list of rows into lists of at most part_size rows"""
+    return [rows[start:start + part_size] for start in range(0, len(rows), part_size)]
+
+def write_part(filename, rows, fieldnames, file_format='csv', schema=None):
+    """Writes one part file; returns its number of rows"""
+    if file_format == 'parquet':
+        encoder = ParquetEncoder(fieldnames, schema)
+    else:
+        encoder = ENCODERS[file_format](fieldnames)
+    sink = SINKS[file_format](filename)
+    try:
+        sink.write(encoder.encode(rows))
+    finally:
+        sink.close()
+    return len(rows)
+
+def save_partitioned(data, entity, fieldnames, base_dir=PARTITIONS_DIR, by_day=False,
+                     part_size=DEFAULT_PART_SIZE, file_format='csv', workers=DEFAULT_WORKERS):
+    """
+    Saves data as part files of at most part_size rows, written by a pool of workers
+
+    With by_day the rows are first grouped by order day (one directory per day).
+    Returns the list of files written.
+    """
+
+    if not data:
+        print("No data to save!")
+        return []
+
+    if by_day:
+        # Rows generated in time-series mode are already sorted, so this is cheap
+        rows = sorted(data, key=partition_day)
+        parts = [
+            (part_filename(base_dir, entity, part, file_format, day), part_rows)
+            for day, day_rows in groupby(rows, key=partition_day)
+            for part, part_rows in enumerate(split_parts(list(day_rows), part_size))
+        ]
+    else:
+        parts = [
+            (part_filename(base_dir, entity, part, file_format), part_rows)
+            for part, part_rows in enumerate(split_parts(data, part_size))
+        ]
+
+    clear_parts(base_dir, entity)
+
+    # All parts share one Parquet schema, inferred from the whole entity
+    schema = ParquetEncoder(fieldnames).infer_schema(data) if file_format == 'parquet' else None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(
+            lambda part: write_part(part[0], part[1], fieldnames, file_format, schema),
+            parts
+        ))
+
+    print(f"Data saved to {os.path.join(base_dir, entity)}")
+    layout = f"{len({os.path.dirname(filename) for filename, _ in parts})} daily partitions" if by_day else f"parts of {part_size} rows"
+    print(f"Total records: {len(data)} in {len(parts)} files ({layout})")
+    return [filename for filename, _ in parts]
+
+def add_partition_arguments(parser, by_day=False):
+    """Adds the partitioned output arguments (--partition-by-day only for orders and items)"""
+    parser.add_argument(
+        '--partitioned',
+        action='store_true',
+        help=f'Save part files under the partitions directory instead of the seed file (default: {PARTITIONS_DIR})'
+    )
+    if by_day:
+        parser.add_argument(
+            '--partition-by-day',
+            action='store_true',
+            help='Save one directory per order day (implies --partitioned)'
+        )
+    parser.add_argument(
+        '--partitions-dir',
+        type=str,
+        default=PARTITIONS_DIR,
+        help='Base directory for part files'
+    )
+    parser.add_argument(
+        '--part-size',
+        type=int,
+        default=DEFAULT_PART_SIZE,
+        help=f'Maximum rows per part file (default: {DEFAULT_PART_SIZE})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f'Part files written in parallel (default: {DEFAULT_WORKERS})'
+    )
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Producer/consumer pipeline for the generator scripts
+Row generation, encoding (CSV or Parquet) and file writes run as separate threads
+connected by bounded queues, so a full queue slows down the stage before it (backpressure)
+"""
+
+import csv
+import io
+import os
+import queue
+import threading
+import time
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Default pipeline settings
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_QUEUE_SIZE = 8
+FILE_FORMATS = ['csv', 'parquet']
+
+# Marks the end of a queue
+_DONE = object()
+
+class PipelineAborted(Exception):
+    """Raised inside a stage when another stage failed"""
+
+class StageStats:
+    """Throughput counters of one pipeline stage"""
+
+    def __init__(self, name):
+        self.name = name
+        self.chunks = 0
+        self.rows = 0
+        self.bytes = 0
+        self.busy_seconds = 0.0
+        self.get_wait_seconds = 0.0
+        self.put_wait_seconds = 0.0
+
+class CsvEncoder:
+    """Encodes chunks of dict rows as CSV bytes (header on the first chunk)"""
+
+    def __init__(self, fieldnames):
+        self.fieldnames = fieldnames
+        self.header_written = False
+
+    def encode(self, rows):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=self.fieldnames)
+        if not self.header_written:
+            writer.writeheader()
+            self.header_written = True
+        writer.writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+def value_kind(values):
+    """Arrow type name of a column's non-null values (None when there are none); '' counts as null"""
+    values = [value for value in values if value is not None and value != '']
+    if not values:
+        return None
+    if all(isinstance(value, bool) for value in values):
+        return 'bool'
+    if all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        return 'int64'
+    if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+        return 'float64'
+    return 'string'
+
+def declared_schema(fieldnames, column_types):
+    """Arrow schema from declared column types (name -> 'int64', 'float64', 'bool'); other columns are strings"""
+    return pa.schema([
+        pa.field(name, pa.type_for_alias(column_types.get(name, 'string'))) for name in fieldnames
+    ])
+
+class ParquetEncoder:
+    """
+    Encodes chunks of dict rows as Arrow tables, with empty strings as nulls
+    (like the columnar cache and the CSV loader store them)
+
+    The schema is declared (column_types) or inferred from the first chunk; a
+    later chunk that does not fit it raises ValueError instead of being cast
+    (an int64 column inferred from a chunk of whole amounts would truncate floats)
+    """
+
+    def __init__(self, fieldnames, schema=None, column_types=None):
+        if pa is None:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+        self.fieldnames = fieldnames
+        if schema is None and column_types:
+            schema = declared_schema(fieldnames, column_types)
+        self.schema = schema
+
+    def infer_schema(self, rows):
+        return pa.schema([
+            pa.field(name, pa.type_for_alias(value_kind(row.get(name) for row in rows) or 'string'))
+            for name in self.fieldnames
+        ])
+
+    def check_chunk(self, columns):
+        """Raises ValueError if a column holds values its schema type would cast"""
+        for field in self.schema:
+            kind = value_kind(columns[field.name])
+            expected = str(field.type).replace('double', 'float64')
+            if kind is None or kind == expected or (kind == 'int64' and expected == 'float64'):
+                continue
+            raise ValueError(
+                f"Column '{field.name}' is {expected} but a chunk has {kind} values; "
+                f"declare its type instead of inferring it from the first chunk"
+            )
+
+    def encode(self, rows):
+        if self.schema is None:
+            self.schema = self.infer_schema(rows)
+        columns = {
+            name: [None if row.get(name) == '' else row.get(name) for row in rows]
+            for name in self.fieldnames
+        }
+        self.check_chunk(columns)
+        return pa.Table.from_pydict(columns, schema=self.schema)
+
+class CsvSink:
+    """Writes encoded CSV chunks to a file"""
+
+    def __init__(self, filename):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self.file = open(filename, 'wb')
+
+    def write(self, payload):
+        self.file.write(payload)
+        return len(payload)
+
+    def close(self):
+        self.file.close()
+
+class ParquetSink:
+    """Writes encoded Arrow tables to a Parquet file"""
+
+    def __init__(self, filename):
+        os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+        self.filename = filename
+        self.writer = None
+
+    def write(self, table):
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.filename, table.schema)
+        self.writer.write_table(table)
+        return table.nbytes
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+ENCODERS = {'csv': CsvEncoder, 'parquet': ParquetEncoder}
+SINKS = {'csv': CsvSink, 'parquet': ParquetSink}
+
+def output_filename(filename, file_format):
+    """Replaces the extension of a seed filename for the chosen format"""
+    return os.path.splitext(filename)[0] + '.' + file_format
+
+def chunked(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Groups an iterable of rows into lists of chunk_size rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class Pipeline:
+    """
+    Runs generate -> encode -> write in three threads
+
+    chunks is an iterable of (output_name, rows) tuples; it is consumed in the
+    generate thread, so a lazy generator does its work there. outputs maps each
+    output_name to (filename, fieldnames) or (filename, fieldnames, column_types),
+    where column_types declares the Parquet type of the non-string columns.
+    """
+
+    def __init__(self, outputs, file_format='csv', queue_size=DEFAULT_QUEUE_SIZE):
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unknown format '{file_format}', expected one of {FILE_FORMATS}")
+        self.outputs = outputs
+        self.file_format = file_format
+        self.encoded_queue = queue.Queue(maxsize=queue_size)
+        self.rows_queue = queue.Queue(maxsize=queue_size)
+        self.failed = threading.Event()
+        self.errors = []
+        self.stats = {name: StageStats(name) for name in ('generate', 'encode', 'write')}
+
+    def _put(self, target_queue, item, stats):
+        start = time.perf_counter()
+        while True:
+            if self.failed.is_set():
+                raise PipelineAborted()
+            try:
+                target_queue.put(item, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        stats.put_wait_seconds += time.perf_counter() - start
+
+    def _get(self, source_queue, stats):
+        start = time.perf_counter()
+        while True:
+            if self.failed.is_set():
+                raise PipelineAborted()
+            try:
+                item = source_queue.get(timeout=0.1)
+                break
+            except queue.Empty:
+                continue
+        stats.get_wait_seconds += time.perf_counter() - start
+        return item
+
+    def _run_stage(self, target):
+        try:
+            target()
+        except PipelineAborted:
+            pass
+        except Exception as e:
+            self.errors.append(e)
+            self.failed.set()
+
+    def _generate(self, chunks):
+        stats = self.stats['generate']
+        iterator = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                name, rows = next(iterator)
+            except StopIteration:
+                break
+            stats.busy_seconds += time.perf_counter() - start
+            stats.chunks += 1
+            stats.rows += len(rows)
+            self._put(self.rows_queue, (name, rows), stats)
+        self._put(self.rows_queue, _DONE, stats)
+
+    def _encode(self):
+        stats = self.stats['encode']
+        encoders = {}
+        for name, (_, fieldnames, *column_types) in self.outputs.items():
+            if self.file_format == 'parquet' and column_types:
+                encoders[name] = ParquetEncoder(fieldnames, column_types=column_types[0])
+            else:
+                encoders[name] = ENCODERS[self.file_format](fieldnames)
+        while True:
+            item = self._get(self.rows_queue, stats)
+            if item is _DONE:
+                break
+            name, rows = item
+            start = time.perf_counter()
+            payload = encoders[name].encode(rows)
+            stats.busy_seconds += time.perf_counter() - start
+            stats.chunks += 1
+            stats.rows += len(rows)
+            self._put(self.encoded_queue, (name, payload, len(rows)), stats)
+        self._put(self.encoded_queue, _DONE, stats)
+
+    def _write(self):
+        stats = self.stats['write']
+        sinks = {}
+        try:
+            while True:
+                item = self._get(self.encoded_queue, stats)
+                if item is _DONE:
+                    break
+                name, payload, num_rows = item
+                start = time.perf_counter()
+                if name not in sinks:
+                    filename = output_filename(self.outputs[name][0], self.file_format)
+                    sinks[name] = SINKS[self.file_format](filename)
+                stats.bytes += sinks[name].write(payload)
+                stats.busy_seconds += time.perf_counter() - start
+                stats.chunks += 1
+                stats.rows += num_rows
+        finally:
+            for sink in sinks.values():
+                sink.close()
+
+    def run(self, chunks):
+        """Runs the pipeline until all chunks are written; returns the wall time"""
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=self._run_stage, args=(lambda: self._generate(chunks),), name='generate'),
+            threading.Thread(target=self._run_stage, args=(self._encode,), name='encode'),
+            threading.Thread(target=self._run_stage, args=(self._write,), name='write')
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.wall_seconds = time.perf_counter() - start
+
+        if self.errors:
+            raise self.errors[0]
+        return self.wall_seconds
+
+    def print_report(self):
+        """Prints per-stage throughput and where each stage spent its time"""
+        print(f"\n{'='*50}")
+        print("🔀 PIPELINE REPORT")
+        print(f"{'='*50}")
+        print(f"Format: {self.file_format}, wall time: {self.wall_seconds:.2f}s")
+        print(f"{'stage':<10}{'rows':>10}{'rows/s':>12}{'busy':>9}{'starved':>9}{'blocked':>9}")
+        for stats in self.stats.values():
+            rows_per_second = stats.rows / stats.busy_seconds if stats.busy_seconds else 0
+            print(
+                f"{stats.name:<10}{stats.rows:>10}{rows_per_second:>12.0f}"
+                f"{stats.busy_seconds:>8.2f}s{stats.get_wait_seconds:>8.2f}s{stats.put_wait_seconds:>8.2f}s"
+            )
+        print(f"Bytes written: {self.stats['write'].bytes}")
+        print("starved = waiting for input, blocked = waiting for a full queue (backpressure)")
+
+def run_pipeline(chunks, outputs, file_format='csv', queue_size=DEFAULT_QUEUE_SIZE):
+    """Convenience wrapper: runs a Pipeline and prints its report"""
+    pipeline = Pipeline(outputs, file_format, queue_size)
+    pipeline.run(chunks)
+    pipeline.print_report()
+    return pipeline
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Lightweight profiling hooks for the generator scripts
+Records per-stage wall time, per-column generation time and rows/sec, and can
+optionally dump cProfile/pstats output
+"""
+
+import cProfile
+import pstats
+import time
+from contextlib import contextmanager
+
+# Time one row out of every DEFAULT_SAMPLE_EVERY rows (per-column timings are
+# extrapolated), so the hooks are cheap enough to leave on
+DEFAULT_SAMPLE_EVERY = 100
+
+class StageTimer:
+    """Yielded by Profiler.stage(); set rows when the count is only known at the end"""
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+class Profiler:
+    """
+    Collects generator timings
+
+    Stages are timed with `stage()`. Column timings use laps: `start_row()` at the
+    beginning of each row and `lap(column, kind)` after each column is computed.
+    Only sampled rows are timed; on the other rows both calls return immediately.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sample_every = DEFAULT_SAMPLE_EVERY
+        self.cprofile_output = None
+        self.stages = {}
+        self.columns = {}
+        self.rows = 0
+        self.sampled_rows = 0
+        self.sampling = False
+        self._last = 0.0
+        self._cprofile = None
+
+    def configure(self, enabled=True, sample_every=DEFAULT_SAMPLE_EVERY, cprofile_output=None):
+        self.enabled = enabled
+        self.sample_every = max(1, sample_every)
+        self.cprofile_output = cprofile_output
+        if enabled and cprofile_output:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Times a stage (generate, write, ...); rows is used for rows/sec"""
+        timer = StageTimer(rows)
+        if not self.enabled:
+            yield timer
+            return
+        start = time.perf_counter()
+        try:
+            yield timer
+        finally:
+            self.add_stage(name, time.perf_counter() - start, timer.rows or 0)
+
+    def add_stage(self, name, seconds, rows=0):
+        """Records a stage timed elsewhere (e.g. by the pipeline)"""
+        if self.enabled:
+            total_seconds, total_rows = self.stages.get(name, (0.0, 0))
+            self.stages[name] = (total_seconds + seconds, total_rows + rows)
+
+    def add_pipeline_stages(self, pipeline):
+        """Records the busy time of each stage of a finished Pipeline"""
+        for stats in pipeline.stats.values():
+            self.add_stage(f"pipeline {stats.name}", stats.busy_seconds, stats.rows)
+        self.add_stage('pipeline wall time', pipeline.wall_seconds, pipeline.stats['write'].rows)
+
+    def start_row(self):
+        if not self.enabled:
+            return
+        self.rows += 1
+        self.sampling = self.rows % self.sample_every == 0
+        if self.sampling:
+            self.sampled_rows += 1
+            self._last = time.perf_counter()
+
+    def lap(self, column, kind):
+        """Charges the time since the previous lap to column (kind: faker, random, date_engine, ...)"""
+        if self.sampling:
+            now = time.perf_counter()
+            key = (column, kind)
+            self.columns[key] = self.columns.get(key, 0.0) + now - self._last
+            self._last = now
+
+    def report(self):
+        """Prints the summary table (and the top cProfile entries if enabled)"""
+        if not self.enabled:
+            return
+
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.cprofile_output)
+
+        print(f"\n{'='*50}")
+        print("🔬 PROFILE")
+        print(f"{'='*50}")
+        print(f"{'stage':<24}{'seconds':>10}{'rows':>10}{'rows/s':>12}")
+        for name, (seconds, rows) in self.stages.items():
+            rows_per_second = f"{rows / seconds:.0f}" if rows and seconds else '-'
+            print(f"{name:<24}{seconds:>10.3f}{rows or '-':>10}{rows_per_second:>12}")
+
+        if self.sampled_rows:
+            # Extrapolate the sampled rows to all rows
+            scale = self.rows / self.sampled_rows
+            total = sum(self.columns.values())
+            print(f"\nColumns ({self.sampled_rows} of {self.rows} rows sampled, 1 in {self.sample_every})")
+            print(f"{'column':<24}{'kind':<12}{'us/row':>10}{'est. s':>10}{'share':>8}")
+            for (column, kind), seconds in sorted(self.columns.items(), key=lambda item: -item[1]):
+                print(
+                    f"{column:<24}{kind:<12}{seconds / self.sampled_rows * 1e6:>10.1f}"
+                    f"{seconds * scale:>10.3f}{seconds / total:>8.1%}"
+                )
+
+            kinds = {}
+            for (_, kind), seconds in self.columns.items():
+                kinds[kind] = kinds.get(kind, 0.0) + seconds
+            print("\nBy kind: " + ", ".join(
+                f"{kind} {seconds / total:.0%}" for kind, seconds in sorted(kinds.items(), key=lambda item: -item[1])
+            ))
+
+        if self._cprofile is not None:
+            print(f"\ncProfile output saved to {self.cprofile_output}")
+            pstats.Stats(self.cprofile_output).sort_stats('cumulative').print_stats(15)
+
+# Shared profiler used by all generator scripts (disabled until configured)
+profiler = Profiler()
+
+def add_profile_arguments(parser):
+    """Adds --profile, --profile-sample and --profile-output to an argument parser"""
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print per-stage and per-column timings and rows/sec'
+    )
+    parser.add_argument(
+        '--profile-sample',
+        type=int,
+        default=DEFAULT_SAMPLE_EVERY,
+        help=f'Time one row out of every N for column timings (default: {DEFAULT_SAMPLE_EVERY})'
+    )
+    parser.add_argument(
+        '--profile-output',
+        type=str,
+        default=None,
+        help='Also run cProfile and save pstats output to this file (implies --profile)'
+    )
+
+def configure_from_args(args):
+    """Enables the shared profiler from parsed --profile arguments"""
+    if args.profile or args.profile_output:
+        profiler.configure(True, args.profile_sample, args.profile_output)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Query-plan capture and regression checks for the dbt project
+Compiles every model and singular test, explains the compiled SQL against the
+generated database and compares the normalized plans with a committed baseline
+"""
+
+import json
+import os
+import re
+import sqlite3
+import sys
+import argparse
+from collections import Counter
+from dbt.cli.main import dbtRunner
+from config import DBT_PROJECT_DIR, DATABASE_FILE, QUERY_PLANS_DIR
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+# Plan lines of SQLite's EXPLAIN QUERY PLAN that matter for regressions, keyed by table
+# without schema. Tables are printed as "<table> AS <alias>" once resolved (and by
+# SQLite before 3.36, with TABLE)
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(?:\w+\.)?(\S+)(?: AS \S+)?(?: LEFT-JOIN)?$')
+INDEX_USAGE = re.compile(r'^(?:SEARCH|SCAN) (?:TABLE )?(?:\w+\.)?(\S+)(?: AS \S+)? USING (?:COVERING |PARTIAL )*(?:INDEX|INTEGER PRIMARY KEY)')
+AUTOMATIC_INDEX = re.compile(r'^(?:SEARCH|SCAN) (?:TABLE )?(?:\w+\.)?(\S+)(?: AS \S+)? USING AUTOMATIC (?:COVERING |PARTIAL )*INDEX')
+TEMP_B_TREE = re.compile(r'^USE TEMP B-TREE FOR (.+)$')
+
+# Table (or CTE) and alias of FROM/JOIN clauses in compiled SQL, e.g. FROM "main"."stg_orders" AS o
+TABLE_REFERENCE = re.compile(
+    r'\b(?:FROM|JOIN)\s+((?:"[^"]+"|\w+)(?:\.(?:"[^"]+"|\w+))*)(?:\s+(?:AS\s+)?("[^"]+"|\w+))?',
+    re.IGNORECASE
+)
+ALIAS_KEYWORDS = {
+    'where', 'on', 'using', 'join', 'left', 'right', 'inner', 'outer', 'full', 'cross', 'natural',
+    'group', 'order', 'having', 'limit', 'window', 'union', 'except', 'intersect'
+}
+PLAN_TABLE = re.compile(r'^((?:SCAN|SEARCH) )(\S+)')
+
+# DuckDB operators mapped to the same categories
+DUCKDB_FULL_SCANS = ('SEQ_SCAN', 'READ_CSV', 'READ_PARQUET')
+DUCKDB_INDEX_SCANS = ('INDEX_SCAN',)
+DUCKDB_SORTS = ('ORDER_BY', 'HASH_GROUP_BY', 'PERFECT_HASH_GROUP_BY', 'TOP_N', 'WINDOW')
+
+def compile_nodes(project_dir, select=None):
+    """Compiles the project; returns {unique_id: compiled SQL} for models and singular tests"""
+    args = ['compile', '--quiet', '--profiles-dir', project_dir]
+    if select:
+        args += ['--select'] + select
+
+    result = dbtRunner().invoke(args)
+    if not result.success:
+        raise RuntimeError(f"dbt compile failed: {result.exception}")
+
+    nodes = {}
+    for node_result in result.result.results:
+        node = node_result.node
+        # Generic tests (not_null, unique, ...) are left out: their plans follow the model's
+        is_singular_test = node.resource_type == 'test' and getattr(node, 'test_metadata', None) is None
+        if (node.resource_type == 'model' or is_singular_test) and node.compiled_code:
+            nodes[node.unique_id] = node.compiled_code
+    return dict(sorted(nodes.items()))
+
+def normalize_detail(detail):
+    """Removes the parts of a plan line that change between runs (subquery numbers)"""
+    detail = re.sub(r'\bSUBQUERY \d+', 'SUBQUERY ?', detail)
+    detail = re.sub(r'\(subquery-\d+\)', '(subquery-?)', detail)
+    return detail.strip()
+
+def table_aliases(sql):
+    """
+    Maps each alias of the compiled SQL to the table or CTE it stands for (several
+    names joined with '/' when CTEs reuse an alias for different tables)
+    """
+    aliases = {}
+    for name, alias in TABLE_REFERENCE.findall(sql):
+        alias = alias.strip('"')
+        if not alias or alias.lower() in ALIAS_KEYWORDS:
+            continue
+        aliases.setdefault(alias, set()).add(name.split('.')[-1].strip('"'))
+    return {alias: '/'.join(sorted(tables)) for alias, tables in aliases.items() if tables != {alias}}
+
+def resolve_alias(detail, aliases):
+    """Rewrites 'SCAN o ...' as 'SCAN stg_orders AS o ...' (SQLite 3.36+ only prints the alias)"""
+    match = PLAN_TABLE.match(detail)
+    if match and match.group(2) in aliases:
+        return f"{match.group(1)}{aliases[match.group(2)]} AS {match.group(2)}{detail[match.end():]}"
+    return detail
+
+def explain_sqlite(connection, sql):
+    """EXPLAIN QUERY PLAN as indented lines (one level per plan depth), with aliases resolved"""
+    rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    aliases = table_aliases(sql)
+    depths = {0: -1}
+    lines = []
+    for node_id, parent, _, detail in rows:
+        depths[node_id] = depths.get(parent, -1) + 1
+        lines.append('  ' * depths[node_id] + resolve_alias(normalize_detail(detail), aliases))
+    return lines
+
+def explain_duckdb(connection, sql):
+    """EXPLAIN (FORMAT JSON) as indented operator lines"""
+    plan = json.loads(connection.execute(f"EXPLAIN (FORMAT JSON) {sql}").fetchall()[0][1])
+    lines = []
+
+    def walk(node, depth):
+        name = node.get('name', '').strip()
+        extra_info = node.get('extra_info') or {}
+        table = extra_info.get('Table') if isinstance(extra_info, dict) else None
+        lines.append('  ' * depth + name + (f" {table}" if table else ''))
+        for child in node.get('children', []):
+            walk(child, depth + 1)
+
+    for node in plan:
+        walk(node, 0)
+    return lines
+
+def plan_features(lines, adapter='sqlite'):
+    """
+    Counts the full scans, index usages, automatic indexes (built by SQLite for
+    one query because no index fits) and temp B-trees (sorts/hash aggregates) of a plan
+    """
+    features = {
+        'full_scans': Counter(), 'index_usage': Counter(), 'automatic_indexes': Counter(),
+        'temp_b_trees': Counter()
+    }
+    for line in lines:
+        detail = line.strip()
+        if adapter == 'duckdb':
+            operator = detail.split(' ')[0]
+            if operator in DUCKDB_FULL_SCANS:
+                features['full_scans'][detail] += 1
+            elif operator in DUCKDB_INDEX_SCANS:
+                features['index_usage'][detail] += 1
+            elif operator in DUCKDB_SORTS:
+                features['temp_b_trees'][operator] += 1
+            continue
+
+        if FULL_SCAN.match(detail):
+            features['full_scans'][FULL_SCAN.match(detail).group(1)] += 1
+        elif INDEX_USAGE.match(detail):
+            features['index_usage'][INDEX_USAGE.match(detail).group(1)] += 1
+        elif AUTOMATIC_INDEX.match(detail):
+            features['automatic_indexes'][AUTOMATIC_INDEX.match(detail).group(1)] += 1
+        if TEMP_B_TREE.match(detail):
+            features['temp_b_trees'][TEMP_B_TREE.match(detail).group(1)] += 1
+    return features
+
+def capture_plans(nodes, adapter='sqlite', database=DATABASE_FILE):
+    """Explains every compiled node; returns {unique_id: {'plan': [...], 'error': ...}}"""
+    if adapter == 'duckdb':
+        if duckdb is None:
+            raise ImportError("--duckdb requires duckdb (pip install duckdb)")
+        connection = duckdb.connect(database, read_only=True)
+        explain = explain_duckdb
+    else:
+        if not os.path.exists(database):
+            raise FileNotFoundError(f"{database} not found. Run dbt build (or load_partitions.py) first.")
+        connection = sqlite3.connect(f"file:{database}?mode=ro", uri=True)
+        explain = explain_sqlite
+
+    plans = {}
+    try:
+        for unique_id, sql in nodes.items():
+            try:
+                plans[unique_id] = {'plan': explain(connection, sql), 'error': None}
+            except Exception as e:
+                # Usually a missing upstream table; recorded so that it shows up in the diff
+                plans[unique_id] = {'plan': [], 'error': str(e).splitlines()[0]}
+    finally:
+        connection.close()
+    return plans
+
+def compare_plans(baseline, current, adapter='sqlite'):
+    """
+    Returns (regressions, changes): regressions are new full scans, lost index
+    usage, new automatic indexes, new temp B-trees and plans that no longer
+    explain; changes are the other differences (new nodes, reordered joins, ...)
+    """
+    regressions = []
+    changes = []
+
+    for unique_id, entry in current.items():
+        if unique_id not in baseline:
+            changes.append((unique_id, 'new node (not in baseline)'))
+            continue
+
+        previous = baseline[unique_id]
+        if entry['error']:
+            if not previous['error']:
+                regressions.append((unique_id, f"plan failed: {entry['error']}"))
+            continue
+        if previous['error']:
+            changes.append((unique_id, 'plan available again'))
+            continue
+        if entry['plan'] == previous['plan']:
+            continue
+
+        before = plan_features(previous['plan'], adapter)
+        after = plan_features(entry['plan'], adapter)
+        found = False
+        for table, count in (after['full_scans'] - before['full_scans']).items():
+            regressions.append((unique_id, f"new full scan: {table}" + (f" (x{count})" if count > 1 else '')))
+            found = True
+        for table, count in (before['index_usage'] - after['index_usage']).items():
+            regressions.append((unique_id, f"lost index usage: {table}" + (f" (x{count})" if count > 1 else '')))
+            found = True
+        for table, count in (after['automatic_indexes'] - before['automatic_indexes']).items():
+            regressions.append((unique_id, f"new automatic index: {table}" + (f" (x{count})" if count > 1 else '')))
+            found = True
+        for purpose, count in (after['temp_b_trees'] - before['temp_b_trees']).items():
+            regressions.append((unique_id, f"new temp B-tree for {purpose}" + (f" (x{count})" if count > 1 else '')))
+            found = True
+        if not found:
+            changes.append((unique_id, 'plan changed'))
+
+    for unique_id in baseline:
+        if unique_id not in current:
+            changes.append((unique_id, 'removed (not compiled)'))
+
+    return regressions, changes
+
+def baseline_path(adapter):
+    return os.path.join(QUERY_PLANS_DIR, f"{adapter}.json")
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Capture query plans of the compiled models and compare them with the baseline'
+    )
+    parser.add_argument(
+        '--project-dir',
+        type=str,
+        default=DBT_PROJECT_DIR,
+        help=f'dbt project directory (default: {DBT_PROJECT_DIR})'
+    )
+    parser.add_argument(
+        '--database',
+        type=str,
+        default=DATABASE_FILE,
+        help=f'Database to explain the queries against (default: {DATABASE_FILE})'
+    )
+    parser.add_argument(
+        '--duckdb',
+        action='store_true',
+        help='Explain against a DuckDB database (--database) instead of SQLite'
+    )
+    parser.add_argument(
+        '--select',
+        nargs='+',
+        default=None,
+        help='dbt selection to compile (default: the whole project)'
+    )
+    parser.add_argument(
+        '--baseline',
+        type=str,
+        default=None,
+        help=f'Baseline file (default: {QUERY_PLANS_DIR}/<adapter>.json)'
+    )
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help='Write the captured plans to the baseline file instead of comparing'
+    )
+    parser.add_argument(
+        '--show-plans',
+        action='store_true',
+        help='Print the plan of every changed node'
+    )
+
+    args = parser.parse_args()
+    adapter = 'duckdb' if args.duckdb else 'sqlite'
+    baseline_file = args.baseline or baseline_path(adapter)
+    project_dir = os.path.abspath(args.project_dir)
+    database = os.path.abspath(args.database)
+
+    # Run from the project directory, like init_project.sh does
+    os.chdir(project_dir)
+
+    print("Compiling models and singular tests...")
+    nodes = compile_nodes(project_dir, args.select)
+    plans = capture_plans(nodes, adapter, database)
+    failed = sum(1 for entry in plans.values() if entry['error'])
+
+    print(f"\n{'='*50}")
+    print("🔎 QUERY PLANS")
+    print(f"{'='*50}")
+    print(f"Nodes explained: {len(plans) - failed}/{len(plans)} ({adapter}: {database})")
+    for unique_id, entry in plans.items():
+        if entry['error']:
+            print(f"  ⚠️  {unique_id}: {entry['error']}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_file)), exist_ok=True)
+        if args.select and os.path.exists(baseline_file):
+            # Only replace the selected nodes
+            with open(baseline_file, encoding='utf-8') as f:
+                plans = {**json.load(f)['plans'], **plans}
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump({'adapter': adapter, 'plans': plans}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline saved to {baseline_file}")
+        return
+
+    if not os.path.exists(baseline_file):
+        print(f"\nNo baseline at {baseline_file}. Run with --update-baseline to create it.")
+        sys.exit(1)
+
+    with open(baseline_file, encoding='utf-8') as f:
+        baseline = json.load(f)['plans']
+    if args.select:
+        baseline = {unique_id: entry for unique_id, entry in baseline.items() if unique_id in plans}
+
+    regressions, changes = compare_plans(baseline, plans, adapter)
+
+    print(f"\nCompared with {baseline_file}")
+    for unique_id, message in changes:
+        print(f"  ℹ️  {unique_id}: {message}")
+    for unique_id, message in regressions:
+        print(f"  ❌ {unique_id}: {message}")
+
+    if args.show_plans:
+        for unique_id in sorted({unique_id for unique_id, _ in regressions + changes}):
+            if unique_id in plans and unique_id in baseline:
+                print(f"\n--- {unique_id} (baseline)")
+                print('\n'.join(baseline[unique_id]['plan']))
+                print(f"+++ {unique_id} (current)")
+                print('\n'.join(plans[unique_id]['plan']))
+
+    if regressions:
+        print(f"\n❌ {len(regressions)} plan regressions. If they are expected, run with --update-baseline.")
+        sys.exit(1)
+    print(f"\n✅ No plan regressions ({len(changes)} other changes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""Makes the scripts importable the way they import each other (flat modules next to config.py)"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
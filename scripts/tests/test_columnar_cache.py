@@ -0,0 +1,66 @@
+"""Columnar cache loads and their verification against the part files"""
+
+import sqlite3
+import pytest
+
+pytest.importorskip('numpy')
+
+from columnar_cache import open_cache, write_cache
+from load_partitions import load_sqlite_from_cache
+from partitions import save_partitioned
+
+FIELDNAMES = ['id', 'name', 'email', 'amount', 'created_at']
+
+def customer_rows():
+    """Rows with empty strings and missing values, in no particular ID order"""
+    return [
+        {'id': 3, 'name': 'Carla', 'email': '', 'amount': 12.5, 'created_at': '2025-01-03 10:00:00'},
+        {'id': 1, 'name': 'Ana', 'email': 'ana@example.com', 'amount': 0.0, 'created_at': '2025-01-01 09:00:00'},
+        {'id': 2, 'name': '', 'email': None, 'amount': None, 'created_at': '2025-01-02 08:30:00'},
+        {'id': 4, 'name': 'Davi', 'email': 'davi@example.com', 'amount': 7.25, 'created_at': '2025-01-04 12:00:00'}
+    ]
+
+def write_entity(tmp_path, rows, file_format, cache_format='numpy'):
+    """Writes rows as part files and as a cache; returns (partitions_dir, cache_dir)"""
+    partitions_dir, cache_dir = tmp_path / 'partitions', tmp_path / 'cache'
+    save_partitioned(rows, 'raw_customers', FIELDNAMES, base_dir=str(partitions_dir), part_size=2, file_format=file_format)
+    write_cache(rows, 'raw_customers', FIELDNAMES, 'test', cache_format, cache_dir=str(cache_dir))
+    return str(partitions_dir), str(cache_dir)
+
+def test_cache_stores_empty_strings_as_nulls(tmp_path):
+    _, cache_dir = write_entity(tmp_path, customer_rows(), 'csv')
+    cache = open_cache('raw_customers', cache_dir=cache_dir)
+    assert cache.values('id') == [1, 2, 3, 4]
+    assert cache.values('name') == ['Ana', None, 'Carla', 'Davi']
+    assert cache.values('email') == ['ana@example.com', None, None, 'davi@example.com']
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_verify_matches_the_part_files(tmp_path, file_format):
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    partitions_dir, cache_dir = write_entity(tmp_path, customer_rows(), file_format)
+    database = str(tmp_path / 'verify.db')
+
+    summary = load_sqlite_from_cache(
+        ['raw_customers'], cache_dir=cache_dir, database=database, seeds_dir=str(tmp_path),
+        verify=True, partitions_dir=partitions_dir, workers=1
+    )
+
+    assert summary[0][2] == 4
+    connection = sqlite3.connect(database)
+    rows = connection.execute('SELECT id, name, email FROM loaded_raw_customers ORDER BY id').fetchall()
+    connection.close()
+    assert rows == [(1, 'Ana', 'ana@example.com'), (2, None, None), (3, 'Carla', None), (4, 'Davi', 'davi@example.com')]
+
+def test_verify_reports_differences(tmp_path):
+    rows = customer_rows()
+    partitions_dir, cache_dir = write_entity(tmp_path, rows, 'csv')
+    rows[0]['name'] = 'Changed'
+    write_cache(rows, 'raw_customers', FIELDNAMES, 'test', cache_dir=cache_dir)
+
+    # The changed row is only in the cache and its original only in the files
+    with pytest.raises(ValueError, match='2 rows'):
+        load_sqlite_from_cache(
+            ['raw_customers'], cache_dir=cache_dir, database=str(tmp_path / 'verify.db'),
+            seeds_dir=str(tmp_path), verify=True, partitions_dir=partitions_dir, workers=1
+        )
@@ -0,0 +1,67 @@
+"""Partitioned output and its load into the loaded_ tables"""
+
+import os
+import sqlite3
+import pytest
+
+from load_partitions import load_sqlite
+from partitions import find_parts, save_partitioned
+
+FIELDNAMES = ['item_id', 'order_id', 'quantity', 'unit_price', 'note', 'created_at']
+
+def item_rows():
+    """Items of three order days, with empty and missing values"""
+    return [
+        {'item_id': 1, 'order_id': 10, 'quantity': 2, 'unit_price': 10.5, 'note': 'gift', 'created_at': '2025-03-01 09:00:00'},
+        {'item_id': 2, 'order_id': 10, 'quantity': 1, 'unit_price': 0.0, 'note': '', 'created_at': '2025-03-01 09:00:00'},
+        {'item_id': 3, 'order_id': 11, 'quantity': 5, 'unit_price': 99.99, 'note': None, 'created_at': '2025-03-02 14:10:00'},
+        {'item_id': 4, 'order_id': 12, 'quantity': 1, 'unit_price': 3.0, 'note': 'late', 'created_at': '2025-03-04 23:59:59'},
+        {'item_id': 5, 'order_id': 12, 'quantity': 3, 'unit_price': 7.25, 'note': '', 'created_at': '2025-03-04 23:59:59'}
+    ]
+
+def expected_rows():
+    """The rows as the loader stores them: empty strings as NULL"""
+    return [
+        tuple(None if row[name] == '' else row[name] for name in FIELDNAMES)
+        for row in item_rows()
+    ]
+
+def load_rows(tmp_path, partitions_dir):
+    database = str(tmp_path / 'loaded.db')
+    load_sqlite(['raw_items'], partitions_dir=partitions_dir, database=database, workers=1)
+    connection = sqlite3.connect(database)
+    columns = ', '.join(FIELDNAMES)
+    rows = connection.execute(f'SELECT {columns} FROM loaded_raw_items ORDER BY item_id').fetchall()
+    types = [row[2] for row in connection.execute('PRAGMA table_info(loaded_raw_items)')]
+    connection.close()
+    return rows, types
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+@pytest.mark.parametrize('by_day', [False, True])
+def test_round_trip(tmp_path, file_format, by_day):
+    if file_format == 'parquet':
+        pytest.importorskip('pyarrow')
+    partitions_dir = str(tmp_path / 'partitions')
+    written = save_partitioned(item_rows(), 'raw_items', FIELDNAMES, base_dir=partitions_dir, by_day=by_day,
+                               part_size=2, file_format=file_format, workers=2)
+
+    assert find_parts(partitions_dir, 'raw_items') == sorted(written)
+    if by_day:
+        days = {os.path.basename(os.path.dirname(filename)) for filename in written}
+        assert days == {'order_date=2025-03-01', 'order_date=2025-03-02', 'order_date=2025-03-04'}
+    else:
+        assert len(written) == 3
+
+    rows, types = load_rows(tmp_path, partitions_dir)
+    assert rows == expected_rows()
+    assert types == ['INT', 'INT', 'INT', 'REAL', 'TEXT', 'TEXT']
+
+def test_rewrite_replaces_the_previous_parts(tmp_path):
+    partitions_dir = str(tmp_path / 'partitions')
+    save_partitioned(item_rows(), 'raw_items', FIELDNAMES, base_dir=partitions_dir, by_day=True, part_size=1)
+    written = save_partitioned(item_rows()[:2], 'raw_items', FIELDNAMES, base_dir=partitions_dir, part_size=2)
+
+    assert find_parts(partitions_dir, 'raw_items') == written
+    assert os.listdir(os.path.join(partitions_dir, 'raw_items')) == ['part-0000.csv']
+    rows, _ = load_rows(tmp_path, partitions_dir)
+    assert rows == expected_rows()[:2]
@@ -0,0 +1,75 @@
+"""CSV/Parquet encoders and the generate -> encode -> write pipeline"""
+
+import csv
+import pytest
+
+from pipeline import CsvEncoder, Pipeline, chunked
+
+pa = pytest.importorskip('pyarrow')
+pq = pytest.importorskip('pyarrow.parquet')
+
+from pipeline import ParquetEncoder
+
+FIELDNAMES = ['id', 'status', 'total_amount']
+TYPES = {'id': 'int64', 'total_amount': 'float64'}
+
+def test_csv_encoder_writes_the_header_once():
+    encoder = CsvEncoder(FIELDNAMES)
+    payload = encoder.encode([{'id': 1, 'status': 'placed', 'total_amount': 0}])
+    payload += encoder.encode([{'id': 2, 'status': '', 'total_amount': 9.5}])
+    assert payload.decode('utf-8').splitlines() == ['id,status,total_amount', '1,placed,0', '2,,9.5']
+
+def test_parquet_encoder_declared_types_keep_floats():
+    encoder = ParquetEncoder(FIELDNAMES, column_types=TYPES)
+    first = encoder.encode([{'id': 1, 'status': 'placed', 'total_amount': 0}])
+    second = encoder.encode([{'id': 2, 'status': 'placed', 'total_amount': 1017.42}])
+    assert first.schema.field('total_amount').type == pa.float64()
+    assert second.column('total_amount').to_pylist() == [1017.42]
+
+def test_parquet_encoder_widens_ints_into_a_float_column():
+    encoder = ParquetEncoder(FIELDNAMES)
+    encoder.encode([{'id': 1, 'status': 'placed', 'total_amount': 2.5}])
+    table = encoder.encode([{'id': 2, 'status': 'placed', 'total_amount': 3}])
+    assert table.column('total_amount').to_pylist() == [3.0]
+
+@pytest.mark.parametrize('value', [1017.42, 'unknown'])
+def test_parquet_encoder_rejects_chunks_that_do_not_fit(value):
+    encoder = ParquetEncoder(FIELDNAMES)
+    encoder.encode([{'id': 1, 'status': 'placed', 'total_amount': 0}])
+    with pytest.raises(ValueError, match="'total_amount' is int64"):
+        encoder.encode([{'id': 2, 'status': 'placed', 'total_amount': value}])
+
+def test_parquet_encoder_stores_empty_strings_as_nulls():
+    encoder = ParquetEncoder(FIELDNAMES)
+    table = encoder.encode([
+        {'id': 1, 'status': '', 'total_amount': ''},
+        {'id': 2, 'status': 'placed', 'total_amount': 4.5}
+    ])
+    assert table.schema.field('total_amount').type == pa.float64()
+    assert table.column('status').to_pylist() == [None, 'placed']
+    assert table.column('total_amount').to_pylist() == [None, 4.5]
+
+def order_rows():
+    """Orders whose first amounts are whole numbers, like zero-amount problem orders"""
+    return [{'id': n, 'status': 'placed', 'total_amount': 0 if n < 3 else n + 0.25} for n in range(1, 7)]
+
+@pytest.mark.parametrize('file_format', ['csv', 'parquet'])
+def test_pipeline_writes_every_chunk(tmp_path, file_format):
+    filename = str(tmp_path / 'raw_orders.csv')
+    chunks = (('raw_orders', rows) for rows in chunked(order_rows(), chunk_size=1))
+    pipeline = Pipeline({'raw_orders': (filename, FIELDNAMES, TYPES)}, file_format, queue_size=2)
+    pipeline.run(chunks)
+
+    assert pipeline.stats['write'].rows == 6
+    if file_format == 'parquet':
+        written = pq.read_table(str(tmp_path / 'raw_orders.parquet')).to_pylist()
+    else:
+        with open(filename, newline='', encoding='utf-8') as f:
+            written = [{**row, 'id': int(row['id']), 'total_amount': float(row['total_amount'])} for row in csv.DictReader(f)]
+    assert [row['total_amount'] for row in written] == [0, 0, 3.25, 4.25, 5.25, 6.25]
+
+def test_pipeline_reports_encoder_errors(tmp_path):
+    chunks = (('raw_orders', rows) for rows in chunked(order_rows(), chunk_size=1))
+    pipeline = Pipeline({'raw_orders': (str(tmp_path / 'raw_orders.csv'), FIELDNAMES)}, 'parquet', queue_size=2)
+    with pytest.raises(ValueError):
+        pipeline.run(chunks)